@@ -12,6 +12,7 @@ from alpaca.trading.requests import (
     GetOrdersRequest,
 )
 from alpaca.trading.enums import OrderSide, TimeInForce, OrderClass, QueryOrderStatus
+from bot.telemetry import log_execution
 
 # Configure logging
 logger = logging.getLogger("execution-manager")
@@ -257,20 +258,15 @@ class ExecutionManager:
         }
 
     def _log_to_bigquery(self, data):
-        """Internal helper to stream a single row to BigQuery."""
+        """Internal helper to queue a single row for the batched BigQuery writer."""
         if not self.bq_client:
             return
 
         try:
-            errors = self.bq_client.insert_rows_json(self.table_id, [data])  # type: ignore
-            if errors:
-                logger.error(
-                    f"[{data.get('ticker', 'Unknown')}] BigQuery Insert Errors: {errors}"
-                )
-            else:
-                logger.info(
-                    f"[{data['ticker']}] Logged execution {data['execution_id']} to {self.table_id}"
-                )
+            log_execution(self.bq_client, self.table_id, data)
+            logger.info(
+                f"[{data['ticker']}] Queued execution {data['execution_id']} for {self.table_id}"
+            )
         except Exception as e:
             logger.warning(
                 f"[{data.get('ticker', 'Unknown')}] Failed to log to BigQuery ({self.table_id}): {e}"
@@ -11,8 +11,9 @@ from bot.telemetry import (
     log_macro_snapshot,
     log_decision,
     log_performance,
+    flush_telemetry,
 )
-import pytz
+from zoneinfo import ZoneInfo
 import traceback
 import threading
 from google.cloud import bigquery
@@ -108,8 +109,11 @@ reconciler = PortfolioReconciler(PROJECT_ID, bq_client)
 # --- 2. CORE UTILITIES ---
 
 
+_NY = ZoneInfo("America/New_York")
+
+
 def _get_ny_time():
-    return datetime.now(pytz.timezone("America/New_York"))
+    return datetime.now(_NY)
 
 
 # Retrieve Alpaca Keys
@@ -1106,7 +1110,7 @@ async def run_audit():
 
             # 2. Morning Volatility Gate — block non-emergency BUYs before 10:00 AM ET
             # High bid-ask spreads and erratic price discovery in the first 30 mins.
-            now_et = datetime.now(pytz.timezone("America/New_York"))
+            now_et = _get_ny_time()
             if now_et.hour == 9 and now_et.minute >= 30:
                 if not is_star and reason != "CONVICTION_ROTATION":
                     log_decision(
@@ -1784,6 +1788,10 @@ async def run_audit_endpoint():
         print(f"🔥 Critical Failure: {e}")
         traceback.print_exc()
         return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        # Ship this cycle's rows while the request still holds CPU; with
+        # cpu_idle the instance is throttled as soon as we respond.
+        await asyncio.to_thread(flush_telemetry)
 
 
 @app.route("/debug/alpaca/<ticker>")
@@ -1,9 +1,11 @@
 from decimal import Decimal
 from typing import Dict
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 from bot.telemetry import log_decision
 
+_NY = ZoneInfo("America/New_York")
+
 
 class SignalAgent:
     """
@@ -40,8 +42,7 @@ class SignalAgent:
         Determines if the US stock market is currently open.
         """
         # Get current time in New York
-        ny_tz = pytz.timezone("America/New_York")
-        now = datetime.now(ny_tz)
+        now = datetime.now(_NY)
 
         # 1. Weekend Check
         if now.weekday() >= 5:
@@ -53,13 +54,7 @@ class SignalAgent:
             return False
 
         # 3. Time Check (9:30 AM - 4:00 PM)
-        market_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
-        market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
-
-        if market_open <= now <= market_close:
-            return True
-
-        return False
+        return (9, 30) <= (now.hour, now.minute) < (16, 0)
 
     def evaluate_bands(
         self,
@@ -1,9 +1,61 @@
+import atexit
+import functools
+import io
 import logging
 import os
+import queue
 import sys
-import json
-from datetime import datetime
-import pytz
+import threading
+import time
+from datetime import datetime, timezone
+import orjson
+from google.cloud import bigquery
+
+# numpy scalars and non-str keys show up in decision payloads built from pandas
+_JSON_OPTS = (
+    orjson.OPT_UTC_Z
+    | orjson.OPT_NAIVE_UTC
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_NON_STR_KEYS
+)
+
+# Static fields resolved once at import rather than per record
+_COMPONENT = os.getenv("K_SERVICE", "trading-bot")
+_NODE_ID = os.getenv("K_SERVICE", "local-bot")
+_STATIC_LOG_PREFIX = {"component": _COMPONENT}
+
+
+def _open_stdout():
+    """
+    Line-buffered writer over its own 4 KiB buffer on the process stdout fd.
+    Each JSON line reaches the kernel as a single write(), even when the
+    interpreter runs unbuffered (PYTHONUNBUFFERED in the Cloud Run image).
+    """
+    try:
+        raw = io.FileIO(sys.__stdout__.fileno(), "w", closefd=False)
+    except (AttributeError, OSError, ValueError):
+        return sys.stdout
+    return io.TextIOWrapper(
+        io.BufferedWriter(raw, buffer_size=4096),
+        encoding="utf-8",
+        write_through=False,
+        line_buffering=True,
+    )
+
+
+_stdout = _open_stdout()
+atexit.register(_stdout.flush)
+# Shared by _emit and the logging handler so lines written from the request
+# thread and the bq-telemetry worker never interleave on the one stream.
+_stdout_lock = threading.RLock()
+
+
+def _emit(payload):
+    """Writes one structured log line; the trailing newline flushes it."""
+    line = orjson.dumps(payload, option=_JSON_OPTS) + b"\n"
+    with _stdout_lock:
+        _stdout.buffer.write(line)
+        _stdout.buffer.flush()
 
 
 # 1. STRUCTURED LOGGING CONFIGURATION
@@ -12,65 +64,314 @@ class CloudLoggingFormatter(logging.Formatter):
         log_entry = {
             "severity": record.levelname,
             "message": record.getMessage(),
-            "component": os.getenv("K_SERVICE", "trading-bot"),
-            "timestamp": datetime.now(pytz.utc).isoformat(),
+            **_STATIC_LOG_PREFIX,
+            "timestamp": datetime.now(timezone.utc),
             "event": getattr(record, "event", "GENERIC"),
             "details": getattr(record, "details", {}),
         }
-        return json.dumps(log_entry)
+        return orjson.dumps(log_entry, option=_JSON_OPTS).decode()
 
 
 # Setup the master logger to use stdout (Cloud Run standard)
 logger = logging.getLogger("master-log")
 logger.setLevel(logging.INFO)
-handler = logging.StreamHandler(sys.stdout)
-handler.setFormatter(CloudLoggingFormatter())
-logger.addHandler(handler)
+_HANDLER_NAME = "cloud-logging-json"
+
+
+def _install_handler():
+    """
+    Attaches the JSON stdout handler once. A re-import must not stack a second
+    handler (every line emitted twice); propagate=False keeps the root logger
+    from formatting and writing the record again.
+    """
+    if not any(h.get_name() == _HANDLER_NAME for h in logger.handlers):
+        handler = logging.StreamHandler(_stdout)
+        handler.lock = _stdout_lock
+        handler.set_name(_HANDLER_NAME)
+        handler.setFormatter(CloudLoggingFormatter())
+        logger.addHandler(handler)
+    logger.propagate = False
+
+
+_install_handler()
 
 # 2. MASTER LOGGING INTERFACE
 
 
-def log_audit(level, message, extra=None):
-    # This format is automatically parsed by Google Cloud Logging
-    entry = {"severity": level, "message": message, "extra": extra or {}}
-    print(json.dumps(entry))
-    sys.stdout.flush()  # Force the log out immediately
+def log_audit(level, message, *args, extra=None):
+    """
+    Audit line through the master logger. `message` is a %-format string and
+    is only interpolated with `args` if the record is actually emitted.
+    """
+    # Encoded once, by CloudLoggingFormatter (parsed by Google Cloud Logging)
+    levelno = logging.getLevelName(level)
+    if not isinstance(levelno, int):
+        levelno = logging.INFO
+    logger.log(
+        levelno, message, *args, extra={"event": "AUDIT", "details": extra or {}}
+    )
 
 
 # 3. BIGQUERY TELEMETRY
 
 
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """
+    Process-wide BigQuery client for telemetry callers that don't pass one.
+    Built on first use so importing this module never triggers ADC lookup.
+    """
+    return bigquery.Client(project=os.getenv("PROJECT_ID"))
+
+
+# BigQuery streaming inserts run on a background worker so the audit cycle
+# never waits on an HTTPS round trip. Producers enqueue (client, table_id, row)
+# in O(1); the worker drains up to _MAX_BATCH rows per insertAll request
+# (the upper end of Google's recommended streaming-insert request size).
+# Rows carry an insertId so a chunk that hits a transient error can be resent
+# without BigQuery storing it twice.
+_MAX_BATCH = 500
+# insert_rows_json's own policy (connection resets, timeouts, 429/5xx and
+# BigQuery's retryable error reasons), capped well below DEFAULT_RETRY's
+# 10 minutes so one stuck chunk can't stall the worker.
+_INSERT_RETRY = bigquery.DEFAULT_RETRY.with_delay(
+    initial=0.5, maximum=4.0, multiplier=2.0
+).with_timeout(15.0)
+_FLUSH_TIMEOUT = 10.0
+_bq_queue: queue.Queue = queue.Queue(maxsize=10_000)
+_dropped_rows = 0
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _fast_insert_rows_json(client, table_id, rows, row_ids=None):
+    """
+    Drop-in for client.insert_rows_json that encodes the insertAll body with
+    orjson instead of letting google-cloud-core json.dumps it. Returns errors
+    in the same [{"index": ..., "errors": [...]}] shape.
+    """
+    # Handles dataset.table ids and domain-scoped projects (example.com:proj)
+    table_ref = bigquery.TableReference.from_string(
+        table_id, default_project=client.project
+    )
+
+    if row_ids is None:
+        entries = [{"json": row} for row in rows]
+    else:
+        entries = [
+            {"json": row} if rid is None else {"insertId": rid, "json": row}
+            for row, rid in zip(rows, row_ids)
+        ]
+    body = orjson.dumps({"rows": entries}, option=_JSON_OPTS)
+    response = client._connection.api_request(
+        method="POST",
+        path=f"{table_ref.path}/insertAll",
+        data=body,
+        content_type="application/json",
+    )
+    return [
+        {"index": int(err["index"]), "errors": err["errors"]}
+        for err in response.get("insertErrors", ())
+    ]
+
+
+def _insert_with_retry(client, table_id, rows, row_ids):
+    """
+    Sends one chunk under _INSERT_RETRY. Only chunks where every row has an
+    insertId are retried; anything else could duplicate.
+    """
+    if row_ids is None or None in row_ids:
+        return _fast_insert_rows_json(client, table_id, rows, row_ids)
+    return _INSERT_RETRY(_fast_insert_rows_json)(client, table_id, rows, row_ids)
+
+
+def _insert_batched(client, table_id, rows, row_ids=None):
+    """Streams rows in chunks of at most _MAX_BATCH; returns collected errors."""
+    errors = []
+    for i in range(0, len(rows), _MAX_BATCH):
+        chunk_ids = None if row_ids is None else row_ids[i : i + _MAX_BATCH]
+        errors.extend(
+            _insert_with_retry(client, table_id, rows[i : i + _MAX_BATCH], chunk_ids)
+        )
+    return errors
+
+
+def _drain_once(block=True):
+    """
+    Pulls up to _MAX_BATCH queued rows and ships them, one insert per table.
+    Returns the number of rows handled.
+    """
+    try:
+        batch = [_bq_queue.get(block=block)]
+    except queue.Empty:
+        return 0
+    while len(batch) < _MAX_BATCH:
+        try:
+            batch.append(_bq_queue.get_nowait())
+        except queue.Empty:
+            break
+
+    # Producers stamp rows with datetime objects; orjson renders them as
+    # RFC 3339 in the same pass that encodes the request body.
+    by_table: dict = {}
+    for client, table_id, row, insert_id in batch:
+        rows, row_ids = by_table.setdefault((client, table_id), ([], []))
+        rows.append(row)
+        row_ids.append(insert_id)
+
+    try:
+        for (client, table_id), (rows, row_ids) in by_table.items():
+            try:
+                errors = _insert_batched(client, table_id, rows, row_ids)
+                if errors:
+                    log_audit(
+                        "ERROR",
+                        "❌ BQ ERROR [%s]: %s",
+                        table_id,
+                        errors,
+                        extra={"table_id": table_id},
+                    )
+            except Exception as e:
+                log_audit(
+                    "ERROR",
+                    "🔥 Critical Telemetry Failure [%s]: %s",
+                    table_id,
+                    e,
+                    extra={"table_id": table_id},
+                )
+    finally:
+        for _ in batch:
+            _bq_queue.task_done()
+    return len(batch)
+
+
+def _bq_worker():
+    while True:
+        _drain_once()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(
+                target=_bq_worker, name="bq-telemetry", daemon=True
+            )
+            _worker.start()
+
+
+def _enqueue(client, table_id, row, insert_id=None):
+    """Hands a row to the background worker; drops it if the queue is full."""
+    global _dropped_rows
+    _ensure_worker()
+    try:
+        _bq_queue.put_nowait((client or get_client(), table_id, row, insert_id))
+    except queue.Full:
+        _dropped_rows += 1
+        log_audit(
+            "WARN",
+            "Telemetry queue full, dropped row for %s (%d dropped so far)",
+            table_id,
+            _dropped_rows,
+            extra={"table_id": table_id, "dropped_rows": _dropped_rows},
+        )
+
+
+def _wait_for_worker(timeout):
+    """Queue.join() with a deadline; False if a batch is still in flight."""
+    deadline = time.monotonic() + timeout
+    with _bq_queue.all_tasks_done:
+        while _bq_queue.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _bq_queue.all_tasks_done.wait(remaining)
+    return True
+
+
+def flush_telemetry(timeout=_FLUSH_TIMEOUT):
+    """
+    Ships every queued telemetry row to BigQuery on the calling thread, then
+    waits up to `timeout` seconds for a batch the worker may have in flight.
+    Called before /run-audit returns (Cloud Run throttles CPU between
+    requests) and at exit, where the deadline keeps shutdown from hanging.
+    """
+    while _drain_once(block=False):
+        pass
+    if not _wait_for_worker(timeout):
+        log_audit(
+            "WARN",
+            "Telemetry flush timed out after %.1fs with rows in flight",
+            timeout,
+        )
+
+
+atexit.register(flush_telemetry)
+
+
+def _maybe_float(v):
+    """float(v), skipping the call when v is already a float or None."""
+    return v if v is None or type(v) is float else float(v)
+
+
+def _maybe_int(v):
+    """int(v), skipping the call when v is already an int or None."""
+    return v if v is None or type(v) is int else int(v)
+
+
+# Performance row skeleton matching the BigQuery schema. log_performance
+# copy()s it and only overwrites the fields that vary.
+_PERF_ROW_TEMPLATE = {
+    "timestamp": None,
+    "paper_equity": 0.0,
+    "tax_buffer_usd": 0.0,
+    "fx_rate_aud": 1.0,
+    "daily_hurdle_aud": 0.0,
+    "net_alpha_usd": 0.0,
+    "node_id": _NODE_ID,
+    "recommendation": "HOLD",
+}
+
+# macro_snapshots column -> (macro_data section, key, caster, default)
+_MACRO_SCHEMA = (
+    ("vix", "indices", "vix", float, 0.0),
+    ("spy_perf", "indices", "spy_perf", float, 0.0),
+    ("qqq_perf", "indices", "qqq_perf", float, 0.0),
+    ("yield_10y", "rates", "10Y", float, 0.0),
+    ("yield_2y", "rates", "2Y", float, 0.0),
+    ("yield_source", "rates", "source", str, ""),
+)
+
+
 def log_macro_snapshot(client, project_id, macro_data: dict):
     """
     Persists one macro context snapshot per audit cycle to BigQuery.
     """
     try:
-        indices = macro_data.get("indices", {})
-        rates = macro_data.get("rates", {})
         calendar = macro_data.get("calendar", [])
-
-        import json
-
+        sections = {src: macro_data.get(src) or {} for src in ("indices", "rates")}
         row = {
-            "timestamp": datetime.now(pytz.utc).isoformat(),
-            "vix": float(indices.get("vix", 0) or 0),
-            "spy_perf": float(indices.get("spy_perf", 0) or 0),
-            "qqq_perf": float(indices.get("qqq_perf", 0) or 0),
-            "yield_10y": float(rates.get("10Y", 0) or 0),
-            "yield_2y": float(rates.get("2Y", 0) or 0),
-            "yield_source": str(rates.get("source", "")),
-            "calendar_json": json.dumps(calendar) if calendar else None,
+            "timestamp": datetime.now(timezone.utc),
+            **{
+                name: caster(sections[src].get(key, default) or default)
+                for name, src, key, caster, default in _MACRO_SCHEMA
+            },
+            "calendar_json": (
+                orjson.dumps(calendar, option=_JSON_OPTS).decode() if calendar else None
+            ),
         }
         table_id = f"{project_id}.trading_data.macro_snapshots"
-        errors = client.insert_rows_json(table_id, [row])
-        if errors:
-            print(f"❌ Macro Snapshot BQ Error: {errors}")
-        else:
-            print(
-                f"🌍 Macro Snapshot stored (VIX={row['vix']}, SPY={row['spy_perf']:.2f}%)"
-            )
+        _enqueue(client, table_id, row, f"macro:{time.time_ns()}")
+        log_audit(
+            "INFO",
+            "🌍 Macro Snapshot queued (VIX=%s, SPY=%.2f%%)",
+            row["vix"],
+            row["spy_perf"],
+        )
     except Exception as e:
-        print(f"⚠️ Macro Snapshot Log Failure: {e}")
+        log_audit("WARN", "⚠️ Macro Snapshot Log Failure: %s", e)
 
 
 def log_watchlist_data(
@@ -91,42 +392,44 @@ def log_watchlist_data(
 ):
     """
     Ensures the JSON keys perfectly match the BigQuery schema.
+    The insert happens on the background worker; see flush_telemetry().
     """
-    row_to_insert = [
-        {
-            "timestamp": datetime.now(pytz.utc).isoformat(),
-            "ticker": ticker,
-            "price": float(price),
-            "sentiment_score": float(sentiment) if sentiment is not None else 0.0,
-            "rsi": float(rsi) if rsi is not None else None,
-            "sma_20": float(sma_20) if sma_20 is not None else None,
-            "sma_50": float(sma_50) if sma_50 is not None else None,
-            "bb_upper": float(bb_upper) if bb_upper is not None else None,
-            "bb_lower": float(bb_lower) if bb_lower is not None else None,
-            "f_score": int(f_score) if f_score is not None else None,
-            "conviction": int(conviction) if conviction is not None else None,
-            "gemini_reasoning": str(gemini_reasoning) if gemini_reasoning else None,
-        }
-    ]
+    if not ticker or not price:
+        log_audit(
+            "WARN",
+            "Skipping empty watchlist row for %r",
+            ticker,
+            extra={"ticker": ticker, "price": price},
+        )
+        return
 
-    try:
-        errors = client.insert_rows_json(table_id, row_to_insert)
-        if errors == []:
-            # Structured Log for Metric Extraction
-            log_payload = {
-                "message": f"[{ticker}] ✅ Telemetry: Logged {ticker} at {price}",
-                "ticker": ticker,
-                "price": float(price),
-                "sentiment_score": float(sentiment) if sentiment is not None else 0.0,
-                "prediction_confidence": int(confidence or 0),
-                "event": "WATCHLIST_LOG",
-            }
-            print(json.dumps(log_payload))
-        else:
-            print(f"❌ BQ ERROR: {errors}")
-            raise RuntimeError(f"Sync failed: {errors}")
-    except Exception as e:
-        print(f"🔥 Critical Telemetry Failure: {e}")
+    row = {
+        "timestamp": datetime.now(timezone.utc),
+        "ticker": ticker,
+        "price": _maybe_float(price),
+        "sentiment_score": 0.0 if sentiment is None else _maybe_float(sentiment),
+        "rsi": _maybe_float(rsi),
+        "sma_20": _maybe_float(sma_20),
+        "sma_50": _maybe_float(sma_50),
+        "bb_upper": _maybe_float(bb_upper),
+        "bb_lower": _maybe_float(bb_lower),
+        "f_score": _maybe_int(f_score),
+        "conviction": _maybe_int(conviction),
+        "gemini_reasoning": str(gemini_reasoning) if gemini_reasoning else None,
+    }
+
+    # Unique per ticker per cycle; BigQuery dedupes retried rows on it
+    _enqueue(client, table_id, row, f"{ticker}:{time.time_ns()}")
+
+    # Structured Log for Metric Extraction
+    log_payload = {
+        "ticker": ticker,
+        "price": row["price"],
+        "sentiment_score": row["sentiment_score"],
+        "prediction_confidence": int(confidence or 0),
+        "event": "WATCHLIST_LOG",
+    }
+    _emit(log_payload)
 
 
 def log_performance(client, table_id, metrics):
@@ -134,39 +437,42 @@ def log_performance(client, table_id, metrics):
     Logs performance metrics (Total Equity) to BigQuery.
     """
     total_equity = float(metrics.get("total_equity", 0.0))
+    if total_equity == 0:
+        log_audit("WARN", "Skipping performance row with zero equity")
+        return
     total_cash = float(metrics.get("total_cash", 0.0))
     total_market_value = float(metrics.get("total_market_value", 0.0))
     exposure = total_market_value / total_equity if total_equity > 0 else 0.0
 
-    row = {
-        "timestamp": datetime.now(pytz.utc).isoformat(),
-        "paper_equity": total_equity,
-        "tax_buffer_usd": 0.0,
-        "fx_rate_aud": float(metrics.get("fx_multiplier", 1.54)),
-        "daily_hurdle_aud": 0.0,
-        "net_alpha_usd": 0.0,
-        "node_id": os.getenv("K_SERVICE", "local-bot"),
-        "recommendation": "HOLD",
-    }
+    row = _PERF_ROW_TEMPLATE.copy()
+    row["timestamp"] = datetime.now(timezone.utc)
+    row["paper_equity"] = total_equity
+    row["fx_rate_aud"] = float(metrics.get("fx_multiplier", 1.54))
 
     try:
-        errors = client.insert_rows_json(table_id, [row])
-        if errors:
-            print(f"❌ Performance Log Error: {errors}")
-        else:
-            # Structured Log for Metric Extraction
-            log_payload = {
-                "message": f"📈 Logged Performance: ${total_equity:.2f}",
-                "paper_equity": total_equity,
-                "total_cash": total_cash,
-                "total_market_value": total_market_value,
-                "exposure_pct": exposure * 100.0,
-                "node_id": os.getenv("K_SERVICE", "local-bot"),
-                "event": "PERFORMANCE_LOG",
-            }
-            print(json.dumps(log_payload))
+        _enqueue(client, table_id, row, f"{_NODE_ID}:{time.time_ns()}")
+
+        # Structured Log for Metric Extraction
+        log_payload = {
+            "message": f"📈 Logged Performance: ${total_equity:.2f}",
+            "paper_equity": total_equity,
+            "total_cash": total_cash,
+            "total_market_value": total_market_value,
+            "exposure_pct": exposure * 100.0,
+            "node_id": _NODE_ID,
+            "event": "PERFORMANCE_LOG",
+        }
+        _emit(log_payload)
     except Exception as e:
-        print(f"🔥 Performance Log Failure: {e}")
+        log_audit("ERROR", "🔥 Performance Log Failure: %s", e)
+
+
+def log_execution(client, table_id, row):
+    """
+    Queues an order's execution row; it ships with the next telemetry batch
+    instead of costing the order path its own streaming insert.
+    """
+    _enqueue(client, table_id, row, f"{row['execution_id']}:{time.time_ns()}")
 
 
 def log_decision(ticker, action, reason, details=None):
@@ -191,5 +497,4 @@ def log_decision(ticker, action, reason, details=None):
         "details": details or {},
         "event": "TRADING_DECISION",
     }
-    print(json.dumps(log_payload))
-    sys.stdout.flush()
+    _emit(log_payload)
@@ -4,7 +4,9 @@ from unittest.mock import patch, MagicMock
 from portfolio_manager import PortfolioManager
 
 
-# This test requires pytest-asyncio to be installed
+# This test requires pytest-asyncio to be installed and the local services
+# running; CI deselects it with -m "not integration"
+@pytest.mark.integration
 @pytest.mark.asyncio
 async def test_service_connectivity_dry_run():
     """
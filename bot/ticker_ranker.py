@@ -1,15 +1,66 @@
 import os
+import io
 import asyncio
+import atexit
 import logging
+import aiohttp
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import List, Dict
+from google.api_core.exceptions import GoogleAPIError
 from google.cloud import bigquery
-import finnhub
+from vertexai.generative_models import GenerationConfig
 from bot.sentiment_analyzer import SentimentAnalyzer
 from bot.feedback_agent import FeedbackAgent
 
 logger = logging.getLogger("TickerRanker")
 
+# Fixed part of the ranking prompt; the lessons and per-ticker headlines (as
+# JSON) are appended to it.
+_PROMPT_HEAD = (
+    "Analyze the overnight news headlines for each ticker below.\n"
+    "For every ticker provide:\n"
+    "1. score: Aggregate Sentiment Score (-1.0 to 1.0).\n"
+    "2. confidence: Prediction Confidence Score (0 to 100): How clearly these"
+    " headlines suggest a price movement (up or down).\n"
+    "3. reason: A brief one-sentence reason.\n"
+    "Return one JSON object per ticker.\n\n"
+)
+
+# Gemini returns the whole run as a JSON array matching this schema
+_RANKING_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "ticker": {"type": "string"},
+            "score": {"type": "number"},
+            "confidence": {"type": "integer"},
+            "reason": {"type": "string"},
+        },
+        "required": ["ticker", "score", "confidence", "reason"],
+    },
+}
+# Must be a GenerationConfig: a plain dict goes through a proto conversion that
+# rejects the lowercase schema types (KeyError: 'array')
+_GENERATION_CONFIG = GenerationConfig(
+    response_mime_type="application/json",
+    response_schema=_RANKING_SCHEMA,
+)
+# One call now covers the whole watchlist, so it gets more room than a
+# single-ticker prompt did
+_GEMINI_TIMEOUT = 120
+
+FINNHUB_NEWS_URL = "https://finnhub.io/api/v1/company-news"
+# Concurrent Finnhub connections per ranking run (kept under the free-tier burst)
+_NEWS_CONCURRENCY = 8
+
+# Below this many rows a streaming insert is cheaper than starting a load job
+_LOAD_JOB_MIN_ROWS = 5
+
 
 class TickerRanker:
     def __init__(self, project_id: str, bq_client: bigquery.Client):
@@ -19,19 +70,33 @@ class TickerRanker:
         self.finnhub_key = os.environ.get("EXCHANGE_API_KEY")
         if self.finnhub_key:
             logger.info(f"✅ Finnhub Key loaded: {self.finnhub_key[:4]}...")
-            self.finnhub_client = finnhub.Client(api_key=self.finnhub_key)
         else:
             logger.warning("❌ Finnhub Key NOT found in environment.")
-            self.finnhub_client = None
 
         self.table_id = f"{project_id}.trading_data.ticker_rankings"
         self.feedback_agent = FeedbackAgent(project_id=project_id, bq_client=bq_client)
 
-    async def fetch_overnight_news(self, ticker: str) -> List[Dict]:
-        """Fetch news from the last 24 hours."""
-        if not self.finnhub_client:
-            logger.warning(f"[{ticker}] Skipping news fetch (No Finnhub Client)")
+        # Blocking Gemini calls get their own pool so they can't starve the
+        # default executor used by other to_thread work (BigQuery).
+        # A ranking run makes a single call, so a couple of workers is plenty.
+        self._gemini_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="gemini"
+        )
+        atexit.register(self._gemini_pool.shutdown, wait=False)
+
+    async def fetch_overnight_news(
+        self, ticker: str, session: aiohttp.ClientSession = None
+    ) -> List[Dict]:
+        """
+        Fetch news from the last 24 hours. Pass the run's shared `session` to
+        reuse its keep-alive connections; without one a session is opened.
+        """
+        if not self.finnhub_key:
+            logger.warning(f"[{ticker}] Skipping news fetch (No Finnhub Key)")
             return []
+        if session is None:
+            async with aiohttp.ClientSession() as session:
+                return await self.fetch_overnight_news(ticker, session)
 
         now = datetime.now(timezone.utc)
         yesterday = now - timedelta(days=1)
@@ -42,16 +107,23 @@ class TickerRanker:
 
             logger.info(f"[{ticker}] Fetching news from {start_date} to {end_date}")
 
-            client = self.finnhub_client
-            news = await asyncio.wait_for(
-                asyncio.to_thread(
-                    client.company_news, ticker, _from=start_date, to=end_date
-                ),
-                timeout=15,
-            )
+            params = {
+                "symbol": ticker,
+                "from": start_date,
+                "to": end_date,
+                "token": self.finnhub_key,
+            }
+            async with session.get(
+                FINNHUB_NEWS_URL, params=params, timeout=aiohttp.ClientTimeout(15)
+            ) as response:
+                if response.status == 429:
+                    logger.warning(f"[{ticker}] ⚠️ Finnhub Rate Limit hit")
+                    return []
+                response.raise_for_status()
+                news = await response.json()
 
-            if isinstance(news, str) and "limit reached" in news.lower():
-                logger.warning(f"[{ticker}] ⚠️ Finnhub Rate Limit hit")
+            if not isinstance(news, list):
+                logger.warning(f"[{ticker}] Unexpected Finnhub response: {news}")
                 return []
 
             logger.info(f"[{ticker}] Found {len(news)} news items.")
@@ -60,116 +132,108 @@ class TickerRanker:
             logger.error(f"[{ticker}] Error fetching news: {e}")
             return []
 
-    async def analyze_ticker(self, ticker: str, lessons: str = "") -> Dict:
-        """Analyze overnight news and get confidence score from Gemini."""
-        news_list = list(await self.fetch_overnight_news(ticker))
-        volume = len(news_list)
-
-        if volume == 0:
-            return {
-                "ticker": ticker,
-                "sentiment": 0.0,
-                "confidence": 0,
-                "reason": "No overnight news found.",
-            }
-
-        # Take top 10 headlines
-        headlines = [str(n.get("headline", "")) for n in news_list[:10]]
-        news_text = "\n".join(headlines)
-
-        prompt = f"""
-        Analyze the following overnight news headlines for {ticker}:
-        {lessons}
-
-        {news_text}
-
-        Provide:
-        1. Aggregate Sentiment Score (-1.0 to 1.0).
-        2. Prediction Confidence Score (0 to 100): How clearly these headlines suggest a price movement (up or down).
-        3. A brief one-sentence reason.
+    @staticmethod
+    def _headlines(news_list: List[Dict]) -> List[str]:
+        """Top 10 non-empty headlines."""
+        return [h for n in islice(news_list, 10) if (h := n.get("headline"))]
 
-        Format your response exactly as:
-        SCORE: [score]
-        CONFIDENCE: [confidence]
-        REASON: [reason]
+    async def analyze_tickers(
+        self, headlines: Dict[str, List[str]], lessons: str = ""
+    ) -> Dict[str, Dict]:
         """
+        Score every ticker's headlines with a single structured-output Gemini
+        call. Returns results keyed by ticker; tickers Gemini leaves out (or a
+        failed call) get a zero-confidence "AI Analysis failed." result.
+        """
+        if not headlines:
+            return {}
 
-        try:
-            import asyncio
-            import concurrent.futures
-
-            if not hasattr(self, "_executor"):
-                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=30)
+        prompt = "".join(
+            (_PROMPT_HEAD, lessons, "\n\n", orjson.dumps(headlines).decode())
+        )
 
+        parsed = {}
+        try:
             loop = asyncio.get_running_loop()
             response = await asyncio.wait_for(
                 loop.run_in_executor(
-                    self._executor,
-                    self.sentiment_analyzer.model.generate_content,
-                    prompt,
+                    self._gemini_pool,
+                    partial(
+                        self.sentiment_analyzer.model.generate_content,
+                        prompt,
+                        generation_config=_GENERATION_CONFIG,
+                    ),
                 ),
-                timeout=45,
+                timeout=_GEMINI_TIMEOUT,
             )
-            text = response.text.strip()
-
-            lines = text.split("\n")
-            score = 0.0
-            confidence = 0
-            reason = "Failed to parse AI response."
-
-            for line in lines:
-                if line.startswith("SCORE:"):
-                    try:
-                        score = float(line.replace("SCORE:", "").strip())
-                    except ValueError:
-                        pass
-                elif line.startswith("CONFIDENCE:"):
-                    try:
-                        confidence = int(line.replace("CONFIDENCE:", "").strip())
-                    except ValueError:
-                        pass
-                elif line.startswith("REASON:"):
-                    reason = line.replace("REASON:", "").strip()
-
-            return {
-                "ticker": ticker,
-                "sentiment": score,
-                "confidence": confidence,
-                "reason": reason,
-                "gemini_reasoning": reason,  # Full Gemini reasoning text
-            }
+            for item in orjson.loads(response.text):
+                ticker = item.get("ticker")
+                if ticker not in headlines:
+                    continue
+                try:
+                    reason = item["reason"]
+                    parsed[ticker] = {
+                        "ticker": ticker,
+                        "sentiment": float(item["score"]),
+                        "confidence": int(item["confidence"]),
+                        "reason": reason,
+                        "gemini_reasoning": reason,  # Full Gemini reasoning text
+                    }
+                except (KeyError, TypeError, ValueError):
+                    logger.warning(f"[{ticker}] Unparseable ranking: {item}")
         except Exception as e:
-            logger.error(f"[{ticker}] Error analyzing {ticker} with Vertex AI: {e}")
-            return {
+            logger.error(f"Error ranking {list(headlines)} with Vertex AI: {e}")
+
+        for ticker in headlines.keys() - parsed.keys():
+            parsed[ticker] = {
                 "ticker": ticker,
                 "sentiment": 0.0,
                 "confidence": 0,
                 "reason": "AI Analysis failed.",
                 "gemini_reasoning": "",
             }
+        return parsed
 
     def log_ranking_to_bq(self, results: List[Dict]):
         """Saves ranking results to BigQuery."""
-        rows = []
         now = datetime.now(timezone.utc).isoformat()
-        for res in results:
-            rows.append(
-                {
-                    "timestamp": now,
-                    "ticker": res["ticker"],
-                    "sentiment": res["sentiment"],
-                    "confidence": res["confidence"],
-                    "reason": res["reason"],
-                    "gemini_reasoning": res.get("gemini_reasoning", ""),
-                }
-            )
+        rows = [
+            {
+                "timestamp": now,
+                "ticker": res["ticker"],
+                "sentiment": res["sentiment"],
+                "confidence": res["confidence"],
+                "reason": res["reason"],
+                "gemini_reasoning": res.get("gemini_reasoning", ""),
+            }
+            for res in results
+        ]
 
-        if rows:
+        if not rows:
+            return
+        if len(rows) < _LOAD_JOB_MIN_ROWS:
             errors = self.bq_client.insert_rows_json(self.table_id, rows)
-            if errors:
-                logger.error(f"BQ Insert Errors: {errors}")
-            else:
-                logger.info(f"Successfully logged {len(rows)} rankings to BQ.")
+        else:
+            # One batch load job instead of per-row streaming validation
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            buf = io.BytesIO(b"\n".join(orjson.dumps(row) for row in rows))
+            try:
+                job = self.bq_client.load_table_from_file(
+                    buf, self.table_id, job_config=job_config
+                )
+                job.result()
+                errors = job.errors
+            except GoogleAPIError as e:
+                # A failed load must not cost the run its (already paid) rankings
+                errors = [str(e)]
+
+        if errors:
+            logger.error(f"BQ Insert Errors: {errors}")
+        else:
+            logger.info(f"Successfully logged {len(rows)} rankings to BQ.")
 
     async def rank_and_log(self, tickers: List[str]):
         """Rank tickers and log to BigQuery."""
@@ -180,7 +244,27 @@ class TickerRanker:
         if lessons:
             logger.info("🧠 Injecting lessons from memory into Gemini...")
 
-        tasks = [self.analyze_ticker(t, lessons) for t in tickers]
-        results = await asyncio.gather(*tasks)
-        self.log_ranking_to_bq(results)
+        # One pooled session per run; the connector limit doubles as the
+        # semaphore on concurrent Finnhub requests.
+        connector = aiohttp.TCPConnector(limit=_NEWS_CONCURRENCY)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            news = await asyncio.gather(
+                *(self.fetch_overnight_news(t, session) for t in tickers)
+            )
+
+        # Tickers without headlines never reach Gemini
+        headlines = {t: h for t, n in zip(tickers, news) if (h := self._headlines(n))}
+        analysed = await self.analyze_tickers(headlines, lessons)
+        results = [
+            analysed.get(t)
+            or {
+                "ticker": t,
+                "sentiment": 0.0,
+                "confidence": 0,
+                "reason": "No overnight news found.",
+            }
+            for t in tickers
+        ]
+        # The load job blocks for seconds; keep it off the event loop
+        await asyncio.to_thread(self.log_ranking_to_bq, results)
         return results
@@ -1,31 +1,55 @@
 # verification.py - Hard Proof Engine with Resilience
+import asyncio
+import functools
+import operator
 import os
-import time
 import finnhub
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 
+# SEC forms that count towards disclosure velocity
+ALLOWED_FORMS = frozenset({"8-K", "4"})
+_MSPR = operator.itemgetter("mspr")
 
-def get_hard_proof(ticker):
+
+@functools.lru_cache(maxsize=1)
+def _client():
+    """Shared Finnhub client so its requests.Session keeps connections alive."""
+    return finnhub.Client(api_key=os.getenv("FINNHUB_KEY"))
+
+
+@functools.lru_cache(maxsize=1)
+def _date_window(today):
+    """60-day (start, end) lookback strings, formatted once per day."""
+    return (
+        (today - timedelta(days=60)).strftime("%Y-%m-%d"),
+        today.strftime("%Y-%m-%d"),
+    )
+
+
+async def get_hard_proof(ticker):
     """
     Surgical Verification of Insider Conviction & Disclosure Velocity.
     Implements retry logic for rate-limit resilience.
     """
-    api_key = os.getenv("FINNHUB_KEY")
-    client = finnhub.Client(api_key=api_key)
-
-    end_date = datetime.now().strftime("%Y-%m-%d")
-    start_date = (datetime.now() - timedelta(days=60)).strftime("%Y-%m-%d")
+    client = _client()
+    start_date, end_date = _date_window(date.today())
 
     # Retry Loop for 429 Resilience
     for attempt in range(3):
         try:
-            # 1. Insider MSPR (Conviction)
-            insider_data = client.stock_insider_sentiment(ticker, start_date, end_date)
-            mspr_sum = sum(item["mspr"] for item in insider_data.get("data", []))
-
-            # 2. SEC Velocity (Event Frequency)
-            filings = client.filings(symbol=ticker, _from=start_date, to=end_date)
-            filing_velocity = len([f for f in filings if f["form"] in ["8-K", "4"]])
+            # Both lookups are independent, so fetch them concurrently
+            insider_data, filings = await asyncio.gather(
+                # 1. Insider MSPR (Conviction)
+                asyncio.to_thread(
+                    client.stock_insider_sentiment, ticker, start_date, end_date
+                ),
+                # 2. SEC Velocity (Event Frequency)
+                asyncio.to_thread(
+                    client.filings, symbol=ticker, _from=start_date, to=end_date
+                ),
+            )
+            mspr_sum = sum(map(_MSPR, insider_data.get("data", ())))
+            filing_velocity = sum(1 for f in filings if f["form"] in ALLOWED_FORMS)
 
             # 3. Decision Logic
             if mspr_sum > 0 and filing_velocity > 0:
@@ -36,7 +60,7 @@ def get_hard_proof(ticker):
             if "429" in str(e):
                 wait = 2 ** (attempt + 1)
                 print(f"⚠️ Rate limit hit for {ticker}. Backing off {wait}s...")
-                time.sleep(wait)
+                await asyncio.sleep(wait)
             else:
                 print(f"❌ Verification Error [{ticker}]: {e}")
                 return 0
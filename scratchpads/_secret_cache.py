@@ -0,0 +1,26 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+import time
+
+CACHE_DIR = os.path.expanduser("~/.cache/trading")
+
+def get_secret(name, ttl=3600):
+    """Secret Manager value via gcloud, memoized on disk for `ttl` seconds."""
+    path = os.path.join(CACHE_DIR, hashlib.sha256(name.encode()).hexdigest())
+    try:
+        if time.time() - os.stat(path).st_mtime < ttl:
+            with open(path) as f:
+                return f.read()
+    except FileNotFoundError:
+        pass
+
+    value = subprocess.run(["gcloud", "secrets", "versions", "access", "latest", f"--secret={name}"], capture_output=True, text=True).stdout.strip()
+    if value:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR)  # created 0600
+        with os.fdopen(fd, "w") as f:
+            f.write(value)
+        os.replace(tmp, path)
+    return value
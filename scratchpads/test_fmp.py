@@ -1,6 +1,15 @@
 import asyncio
 import os
 import aiohttp
+import orjson
+
+async def fetch(session, url):
+    async with session.get(url) as resp:
+        if resp.status == 200:
+            data = await resp.json(loads=orjson.loads)
+            return f"{url[:60]}... -> {resp.status}\nData snippet: {str(data)[:100]}"
+        text = (await resp.content.read(256)).decode(errors="replace")
+        return f"{url[:60]}... -> {resp.status}\nError: {text[:100]}"
 
 async def main():
     fmp_key = os.getenv("FMP_KEY")
@@ -16,15 +25,12 @@ async def main():
         f"https://financialmodelingprep.com/api/v3/quote/AAPL?apikey={fmp_key}"
     ]
     
-    async with aiohttp.ClientSession() as session:
-        for url in urls:
-            async with session.get(url) as resp:
-                print(f"{url[:60]}... -> {resp.status}")
-                if resp.status == 200:
-                    data = await resp.json()
-                    print(f"Data snippet: {str(data)[:100]}")
-                else:
-                    text = await resp.text()
-                    print(f"Error: {text[:100]}")
+    # Cache the FMP lookup across probes and fail fast on a hung endpoint
+    connector = aiohttp.TCPConnector(limit_per_host=20, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(*(fetch(session, url) for url in urls))
+    for line in results:
+        print(line)
 
 asyncio.run(main())
@@ -1,5 +1,5 @@
 import requests
-import json
+import orjson
 import os
 from dotenv import load_dotenv
 
@@ -16,7 +16,7 @@ for url in endpoints:
     r = requests.get(url)
     print(url.replace(key, "XXX")[:70], r.status_code)
     try:
-        data = r.json()
+        data = orjson.loads(r.content)
         print(str(data)[:100])
     except:
         print(r.text[:100])
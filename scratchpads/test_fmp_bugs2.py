@@ -1,9 +1,11 @@
-import requests
-import subprocess
-import json
+import asyncio
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+from _secret_cache import get_secret
 
-key = subprocess.run(["gcloud", "secrets", "versions", "access", "latest", "--secret=FMP_KEY"], capture_output=True, text=True).stdout.strip()
-finnhub_key = subprocess.run(["gcloud", "secrets", "versions", "access", "latest", "--secret=FINNHUB_KEY"], capture_output=True, text=True).stdout.strip()
+# Cache misses start both gcloud processes at once
+with ThreadPoolExecutor(max_workers=2) as ex:
+    key, finnhub_key = ex.map(get_secret, ["FMP_KEY", "FINNHUB_KEY"])
 
 print("Testing FMP Earning Calendar and Quotes")
 from datetime import datetime
@@ -18,9 +20,16 @@ urls = [
     f"https://financialmodelingprep.com/stable/quote-short?symbol=AAPL,MSFT&apikey={key}"
 ]
 
-for url in urls:
-    print(f"URL: {url.replace(key, 'XXX')}")
-    r = requests.get(url)
-    print(f"Status: {r.status_code}")
-    print(f"Snippet: {r.text[:100]}")
-    print("-")
+async def fetch(session, url):
+    async with session.get(url) as r:
+        return f"URL: {url.replace(key, 'XXX')}\nStatus: {r.status}\nSnippet: {(await r.content.read(256)).decode(errors='replace')[:100]}\n-"
+
+async def main():
+    # All six probes in flight at once over one pooled session
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        results = await asyncio.gather(*(fetch(session, url) for url in urls))
+    for block in results:
+        print(block)
+
+asyncio.run(main())
@@ -1,5 +1,6 @@
-import requests
-import json
+import asyncio
+import aiohttp
+import orjson
 import os
 from dotenv import load_dotenv
 
@@ -15,14 +16,25 @@ endpoints = [
   f"https://financialmodelingprep.com/api/v3/technical_indicator/1day/AAPL?type=sma&period=20&apikey={key}"
 ]
 
-for url in endpoints:
+async def fetch(session, url):
     try:
-        r = requests.get(url)
-        print(url.replace(key, "XXX")[:70], r.status_code)
-        try:
-            data = r.json()
-            print(str(data)[:100])
-        except:
-            print(r.text[:100])
+        async with session.get(url) as r:
+            line = f"{url.replace(key, 'XXX')[:70]} {r.status}"
+            try:
+                data = await r.json(loads=orjson.loads, content_type=None)
+                return f"{line}\n{str(data)[:100]}"
+            except ValueError:
+                return f"{line}\n{(await r.text())[:100]}"
     except Exception as e:
-        print("ERROR:", e)
+        return f"ERROR: {e}"
+
+async def main():
+    # Cache the FMP lookup across probes and fail fast on a hung endpoint
+    connector = aiohttp.TCPConnector(limit_per_host=20, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        results = await asyncio.gather(*(fetch(session, url) for url in endpoints))
+    for line in results:
+        print(line)
+
+asyncio.run(main())
@@ -1,17 +1,21 @@
 import asyncio
 import os
 import aiohttp
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 FMP_KEY = os.getenv("FMP_KEY")
 
 async def test():
-    async with aiohttp.ClientSession() as session:
+    # Cache the FMP lookup across probes and fail fast on a hung endpoint
+    connector = aiohttp.TCPConnector(limit_per_host=20, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
         url = f"https://financialmodelingprep.com/api/v3/historical-price-full/AAPL?apikey={FMP_KEY}"
         async with session.get(url) as resp:
             print(resp.status)
-            data = await resp.json()
+            data = await resp.json(loads=orjson.loads)
             print(data.keys() if isinstance(data, dict) else type(data))
             if "historical" in data:
                 print(data["historical"][0])
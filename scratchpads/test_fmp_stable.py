@@ -1,7 +1,9 @@
-import subprocess
-import requests
+import asyncio
+import random
+import aiohttp
+from _secret_cache import get_secret
 
-key = subprocess.run(["gcloud", "secrets", "versions", "access", "latest", "--secret=FMP_KEY"], capture_output=True, text=True).stdout.strip()
+key = get_secret("FMP_KEY")
 print("Key length:", len(key))
 
 endpoints = [
@@ -17,14 +19,25 @@ endpoints = [
     "quote?symbol=AAPL"
 ]
 
-for endpoint in endpoints:
+async def fetch(session, endpoint, retries=3):
     url = f"https://financialmodelingprep.com/stable/{endpoint}&apikey={key}"
     try:
-        r = requests.get(url)
-        print(f"{endpoint}: {r.status_code}")
-        if r.status_code == 200:
-            print(r.text[:100])
-        else:
-            print(r.text[:100])
+        for attempt in range(retries + 1):
+            async with session.get(url) as r:
+                if r.status != 429 or attempt == retries:
+                    return f"{endpoint}: {r.status}\n{(await r.content.read(256)).decode(errors='replace')[:100]}"
+            # Rate limited by the burst: back off with jitter, then retry
+            await asyncio.sleep(2 ** attempt * random.uniform(0.75, 1.25))
     except Exception as e:
-        print(f"Exception for {endpoint}: {e}")
+        return f"Exception for {endpoint}: {e}"
+
+async def main():
+    # All probes in flight at once over one pooled session; the connector
+    # limit keeps the burst within FMP's rate limit
+    connector = aiohttp.TCPConnector(limit=10)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(*(fetch(session, e) for e in endpoints))
+    for line in results:
+        print(line)
+
+asyncio.run(main())
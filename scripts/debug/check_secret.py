@@ -1,16 +1,26 @@
+import hmac
+
 from google.cloud import secretmanager
 
 project_id = "utopian-calling-429014-r9"
 secret_id = "FINNHUB_KEY"
 version_id = "latest"
 
-client = secretmanager.SecretManagerServiceClient()
-name = f"projects/{project_id}/secrets/{secret_id}/versions/{version_id}"
+PLACEHOLDER = b"PLACEHOLDER_INIT"
+
+
+def is_placeholder(raw: bytes) -> bool:
+    # Compare the raw payload bytes; no decode needed to rule out a match
+    return len(raw) == len(PLACEHOLDER) and hmac.compare_digest(raw, PLACEHOLDER)
+
+
+if __name__ == "__main__":
+    client = secretmanager.SecretManagerServiceClient()
+    name = f"projects/{project_id}/secrets/{secret_id}/versions/{version_id}"
 
-response = client.access_secret_version(request={"name": name})
-payload = response.payload.data.decode("UTF-8")
+    response = client.access_secret_version(request={"name": name})
 
-if payload == "PLACEHOLDER_INIT":
-    print("CONFIRMED_PLACEHOLDER")
-else:
-    print("VALUE_SET_BUT_INVALID_OR_UNKNOWN")
+    if is_placeholder(response.payload.data):
+        print("CONFIRMED_PLACEHOLDER")
+    else:
+        print("VALUE_SET_BUT_INVALID_OR_UNKNOWN")
@@ -1,13 +1,36 @@
 #!/usr/bin/env python3
 import os
-import csv
 import argparse
+import functools
+import re
 from google.cloud import bigquery
 from datetime import datetime
-import pytz
+import pyarrow.csv as pa_csv
 
 
-def extract_trades(hours=24, output_file=None):
+# EXPORT DATA needs exactly one '*' in the URI; quotes and backslashes would
+# break out of the uri='...' literal the value is spliced into.
+_GCS_URI_RE = re.compile(r"^gs://[^'\\]+\*[^'\\]*$")
+
+
+def _check_gcs_uri(uri):
+    if not _GCS_URI_RE.fullmatch(uri) or uri.count("*") != 1:
+        raise ValueError(
+            f"Invalid GCS URI {uri!r}: expected gs://bucket/path/prefix_*.csv "
+            "with a single '*' and no quotes or backslashes."
+        )
+    return uri
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(project_id):
+    return bigquery.Client(project=project_id)
+
+
+def extract_trades(hours=24, output_file=None, gcs_uri=None):
+    if gcs_uri:
+        _check_gcs_uri(gcs_uri)
+
     project_id = os.getenv("PROJECT_ID")
     if not project_id:
         print(
@@ -15,7 +38,7 @@ def extract_trades(hours=24, output_file=None):
         )
         return
 
-    client = bigquery.Client(project=project_id)
+    client = _get_client(project_id)
 
     if not output_file:
         timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -37,7 +60,7 @@ def extract_trades(hours=24, output_file=None):
             e.price,
             e.status
         FROM `{project_id}.trading_data.executions` e
-        WHERE e.timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours} HOUR)
+        WHERE e.timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @hours HOUR)
     ),
     ClosestWatchlist AS (
         SELECT 
@@ -50,7 +73,8 @@ def extract_trades(hours=24, output_file=None):
             w.f_score AS F_Score,
             w.conviction AS Conf
         FROM `{project_id}.trading_data.watchlist_logs` w
-        WHERE w.timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours + 48} HOUR)
+        WHERE w.timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @hours_ext HOUR)
+          AND w.ticker IN (SELECT DISTINCT ticker FROM RecentTrades)
     ),
     ClosestFundamental AS (
         SELECT 
@@ -58,52 +82,108 @@ def extract_trades(hours=24, output_file=None):
             f.timestamp AS f_timestamp,
             f.is_healthy
         FROM `{project_id}.trading_data.fundamental_cache` f
-        WHERE f.timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL {hours + 48} HOUR)
+        WHERE f.timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @hours_ext HOUR)
+          AND f.ticker IN (SELECT DISTINCT ticker FROM RecentTrades)
+    ),
+    -- Latest prior watchlist / fundamental snapshot per execution, picked with
+    -- ARRAY_AGG(... LIMIT 1) instead of a ROW_NUMBER() sort over the whole join
+    LatestWatchlist AS (
+        SELECT
+            t.execution_id,
+            ARRAY_AGG(c ORDER BY c.w_timestamp DESC LIMIT 1)[OFFSET(0)] AS w
+        FROM RecentTrades t
+        JOIN ClosestWatchlist c
+          ON t.ticker = c.ticker
+          AND c.w_timestamp <= t.timestamp
+        GROUP BY t.execution_id
+    ),
+    LatestFundamental AS (
+        SELECT
+            t.execution_id,
+            ARRAY_AGG(cf ORDER BY cf.f_timestamp DESC LIMIT 1)[OFFSET(0)].is_healthy AS is_healthy
+        FROM RecentTrades t
+        JOIN ClosestFundamental cf
+          ON t.ticker = cf.ticker
+          AND cf.f_timestamp <= t.timestamp
+        GROUP BY t.execution_id
     ),
-    Matched AS (
+    MatchedWithHealth AS (
         SELECT 
             t.timestamp,
             t.ticker,
             t.BUY_SELL,
             COALESCE(TRIM(REGEXP_EXTRACT(t.reason_signal, r'(Signal:\\s*[^|]+)')), t.reason_signal) AS extracted_signal,
             COALESCE(TRIM(REGEXP_EXTRACT(t.reason_signal, r'(AI:\\s*\\d+)')), '') AS extracted_ai_score,
-            c.AI AS gemini_ai,
-            c.Sent,
-            c.RSI,
-            c.Vlty,
-            c.F_Score,
-            c.Conf,
+            lw.w.AI AS gemini_ai,
+            lw.w.Sent,
+            lw.w.RSI,
+            lw.w.Vlty,
+            lw.w.F_Score,
+            lw.w.Conf,
+            lf.is_healthy,
             t.price,
             t.status
         FROM RecentTrades t
-        LEFT JOIN ClosestWatchlist c 
-          ON t.ticker = c.ticker 
-          AND c.w_timestamp <= t.timestamp
-        -- Get the closest prior matching watchlist entry for this exact execution
-        QUALIFY ROW_NUMBER() OVER(PARTITION BY t.execution_id ORDER BY c.w_timestamp DESC) = 1
-    ),
-    MatchedWithHealth AS (
-        SELECT 
-            m.*,
-            cf.is_healthy
-        FROM Matched m
-        LEFT JOIN ClosestFundamental cf 
-          ON m.ticker = cf.ticker 
-          AND cf.f_timestamp <= m.timestamp
-        QUALIFY ROW_NUMBER() OVER(PARTITION BY m.ticker, m.timestamp ORDER BY cf.f_timestamp DESC) = 1
+        LEFT JOIN LatestWatchlist lw USING (execution_id)
+        LEFT JOIN LatestFundamental lf USING (execution_id)
     )
-    SELECT * FROM MatchedWithHealth
-    ORDER BY timestamp DESC;
+    -- Formatting happens here so the rows can be streamed straight to CSV
+    SELECT
+        FORMAT_TIMESTAMP('%FT%H:%M:%E*S%Ez', m.timestamp, 'America/New_York') AS ts_ny,
+        m.ticker,
+        m.BUY_SELL,
+        m.extracted_signal,
+        m.extracted_ai_score,
+        FORMAT('%.2f', m.Sent) AS Sent,
+        FORMAT('%.2f', m.RSI) AS RSI,
+        FORMAT('%.4f', m.Vlty) AS Vlty,
+        m.F_Score,
+        m.Conf,
+        CASE WHEN m.is_healthy THEN 'True' WHEN NOT m.is_healthy THEN 'False' END AS is_healthy,
+        FORMAT('%.2f', m.price) AS price,
+        m.status,
+        m.gemini_ai
+    FROM MatchedWithHealth m
+    ORDER BY m.timestamp DESC
     """
 
+    # hours travels as a parameter, so nothing is interpolated into the SQL and
+    # every run submits the same query text. (CURRENT_TIMESTAMP() means the
+    # results cache never answers this query.)
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("hours", "INT64", hours),
+            bigquery.ScalarQueryParameter("hours_ext", "INT64", hours + 48),
+        ],
+        use_query_cache=True,
+    )
+
+    if gcs_uri:
+        # Let BigQuery write the CSV shards itself; nothing comes back to Python.
+        # Column headers are the SELECT aliases (e.g. BUY_SELL, ts_ny).
+        export = f"""
+    EXPORT DATA OPTIONS(
+        uri='{gcs_uri}',
+        format='CSV',
+        header=true,
+        overwrite=true
+    ) AS
+    """
+        try:
+            client.query(export + query, job_config=job_config).result()
+        except Exception as e:
+            print(f"Error exporting to GCS: {e}")
+            return
+        print(f"✅ Exported trades to {gcs_uri}")
+        return
+
     try:
-        results = client.query(query).result()
-        rows = list(results)
+        results = client.query(query, job_config=job_config).result()
     except Exception as e:
         print(f"Error executing BigQuery query: {e}")
         return
 
-    if not rows:
+    if not results.total_rows:
         print(f"No trades found in the last {hours} hours.")
         return
 
@@ -126,36 +206,18 @@ def extract_trades(hours=24, output_file=None):
     ]
 
     try:
-        with open(output_file, mode="w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-
-            for row in rows:
-                nyc_time = ""
-                if row.timestamp:
-                    nyc_time = row.timestamp.astimezone(
-                        pytz.timezone("America/New_York")
-                    ).isoformat()
-
-                writer.writerow(
-                    [
-                        nyc_time,
-                        row.ticker,
-                        row.BUY_SELL,
-                        row.extracted_signal,
-                        row.extracted_ai_score,
-                        f"{row.Sent:.2f}" if row.Sent is not None else "",
-                        f"{row.RSI:.2f}" if row.RSI is not None else "",
-                        f"{row.Vlty:.4f}" if row.Vlty is not None else "",
-                        row.F_Score,
-                        row.Conf,
-                        row.is_healthy,
-                        f"{row.price:.2f}" if row.price is not None else "",
-                        row.status,
-                        row.gemini_ai,
-                    ]
-                )
-        print(f"✅ Successfully exported {len(rows)} trades to {output_file}")
+        written = 0
+        with open(output_file, mode="wb") as f:
+            writer = None
+            for batch in results.to_arrow_iterable():
+                batch = batch.rename_columns(headers)
+                if writer is None:
+                    writer = pa_csv.CSVWriter(f, batch.schema)
+                writer.write_batch(batch)
+                written += batch.num_rows
+            if writer is not None:
+                writer.close()
+        print(f"✅ Successfully exported {written} trades to {output_file}")
     except Exception as e:
         print(f"Error writing to CSV: {e}")
 
@@ -169,6 +231,15 @@ if __name__ == "__main__":
         help="Number of hours to look back (default: 24)",
     )
     parser.add_argument("--output", type=str, default=None, help="Output CSV filename")
+    parser.add_argument(
+        "--gcs-uri",
+        type=str,
+        default=None,
+        help="Export server-side to GCS instead, e.g. gs://bucket/recent_trades_*.csv",
+    )
 
     args = parser.parse_args()
-    extract_trades(hours=args.hours, output_file=args.output)
+    try:
+        extract_trades(hours=args.hours, output_file=args.output, gcs_uri=args.gcs_uri)
+    except ValueError as e:
+        parser.error(str(e))
@@ -27,7 +27,7 @@ resource "google_logging_metric" "paper_equity" {
 
 resource "google_logging_metric" "sentiment_score" {
   name   = "trading/sentiment_score"
-  filter = "resource.type=\"cloud_run_revision\" AND jsonPayload.message=~\"Telemetry: Logged\""
+  filter = "resource.type=\"cloud_run_revision\" AND jsonPayload.event=\"WATCHLIST_LOG\""
   metric_descriptor {
     metric_kind = "DELTA"
     value_type  = "DISTRIBUTION"
@@ -106,7 +106,7 @@ resource "google_logging_metric" "exposure_pct" {
 
 resource "google_logging_metric" "prediction_confidence" {
   name   = "trading/prediction_confidence"
-  filter = "resource.type=\"cloud_run_revision\" AND jsonPayload.message=~\"Telemetry: Logged\""
+  filter = "resource.type=\"cloud_run_revision\" AND jsonPayload.event=\"WATCHLIST_LOG\""
   metric_descriptor {
     metric_kind = "DELTA"
     value_type  = "DISTRIBUTION"
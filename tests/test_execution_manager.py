@@ -14,15 +14,30 @@ mock_bigquery = MagicMock()
 mock_google.cloud = mock_cloud
 mock_cloud.bigquery = mock_bigquery
 
-# Inject into sys.modules
-sys.modules["google"] = mock_google
-sys.modules["google.cloud"] = mock_cloud
-sys.modules["google.cloud.bigquery"] = mock_bigquery
-
 # Ensure bot directory is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 
-from bot.execution_manager import ExecutionManager
+# telemetry binds bigquery's retry policy at import; load it against the real
+# library first so the shared module isn't left holding the mocks.
+import bot.telemetry  # noqa: E402,F401
+
+# Inject into sys.modules only while execution_manager binds them, then put the
+# real entries back so other test modules still import the genuine libraries.
+_mocked_modules = {
+    "google": mock_google,
+    "google.cloud": mock_cloud,
+    "google.cloud.bigquery": mock_bigquery,
+}
+_saved_modules = {name: sys.modules.get(name) for name in _mocked_modules}
+sys.modules.update(_mocked_modules)
+try:
+    from bot.execution_manager import ExecutionManager
+finally:
+    for name, module in _saved_modules.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
 
 
 class TestExecutionManager(unittest.TestCase):
@@ -49,9 +64,10 @@ class TestExecutionManager(unittest.TestCase):
             manager = ExecutionManager()
             self.assertIsNone(manager.bq_client)
 
-    @patch("google.cloud.bigquery.Client")
-    def test_place_order_logging(self, mock_bq_client):
-        """Test that place_order calls _log_to_bigquery."""
+    @patch("bot.execution_manager.log_execution")
+    @patch("bot.execution_manager.bigquery.Client")
+    def test_place_order_logging(self, mock_bq_client, mock_log_execution):
+        """Test that place_order queues its execution row for the batched writer."""
         # Setup Mock
         mock_client_instance = MagicMock()
         mock_bq_client.return_value = mock_client_instance
@@ -70,19 +86,21 @@ class TestExecutionManager(unittest.TestCase):
         self.assertEqual(result["status"], "FILLED")
         self.assertEqual(result["details"]["ticker"], "NVDA")
 
-        # Verify BQ insertion was attempted
-        mock_client_instance.insert_rows_json.assert_called_once()
-        call_args = mock_client_instance.insert_rows_json.call_args
-        self.assertEqual(call_args[0][0], "trading_data.executions")  # check table_id
-        self.assertEqual(call_args[0][1][0]["ticker"], "NVDA")  # check data payload
-
-    @patch("google.cloud.bigquery.Client")
-    def test_log_error_handling(self, mock_bq_client):
+        # Verify the row was queued rather than streamed inline
+        mock_client_instance.insert_rows_json.assert_not_called()
+        mock_log_execution.assert_called_once()
+        client, table_id, row = mock_log_execution.call_args[0]
+        self.assertIs(client, mock_client_instance)
+        self.assertEqual(table_id, "trading_data.executions")  # check table_id
+        self.assertEqual(row["ticker"], "NVDA")  # check data payload
+
+    @patch("bot.execution_manager.log_execution")
+    @patch("bot.execution_manager.bigquery.Client")
+    def test_log_error_handling(self, mock_bq_client, mock_log_execution):
         """Test that logging failure doesn't crash the app."""
-        mock_client_instance = MagicMock()
-        # Simulate an API error (e.g. 404 table not found)
-        mock_client_instance.insert_rows_json.side_effect = Exception("Table not found")
-        mock_bq_client.return_value = mock_client_instance
+        mock_bq_client.return_value = MagicMock()
+        # Simulate a failure handing the row to the writer
+        mock_log_execution.side_effect = Exception("Table not found")
 
         manager = ExecutionManager()
 
@@ -1,6 +1,7 @@
 import sys
 import os
 import unittest
+from types import MappingProxyType
 from unittest.mock import MagicMock, patch, AsyncMock
 
 # Ensure bot directory is in path
@@ -9,6 +10,44 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 from bot.fundamental_agent import FundamentalAgent
 
 
+# Two years of statements, built once and shared read-only by the tests
+_MOCK_FINANCIALS = MappingProxyType(
+    {
+        "income": [
+            {
+                "revenue": 1000,
+                "netIncome": 100,
+                "grossProfit": 500,
+                "weightedAverageShsOut": 10,
+            },
+            {
+                "revenue": 800,
+                "netIncome": 50,
+                "grossProfit": 300,
+                "weightedAverageShsOut": 10,
+            },
+        ],
+        "balance": [
+            {
+                "totalAssets": 500,
+                "totalLiabilities": 100,
+                "totalDebt": 100,
+                "totalCurrentAssets": 200,
+                "totalCurrentLiabilities": 100,
+            },
+            {
+                "totalAssets": 400,
+                "totalLiabilities": 120,
+                "totalDebt": 120,
+                "totalCurrentAssets": 150,
+                "totalCurrentLiabilities": 80,
+            },
+        ],
+        "cash": [{"operatingCashFlow": 150}, {"operatingCashFlow": 100}],
+    }
+)
+
+
 class TestFundamentalAgent(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.agent = FundamentalAgent()
@@ -38,39 +77,7 @@ class TestFundamentalAgent(unittest.IsolatedAsyncioTestCase):
     ):
         """Test deep health F-Score calculation."""
         mock_health.return_value = (True, "Healthy")
-        mock_financials.return_value = {
-            "income": [
-                {
-                    "revenue": 1000,
-                    "netIncome": 100,
-                    "grossProfit": 500,
-                    "weightedAverageShsOut": 10,
-                },
-                {
-                    "revenue": 800,
-                    "netIncome": 50,
-                    "grossProfit": 300,
-                    "weightedAverageShsOut": 10,
-                },
-            ],
-            "balance": [
-                {
-                    "totalAssets": 500,
-                    "totalLiabilities": 100,
-                    "totalDebt": 100,
-                    "totalCurrentAssets": 200,
-                    "totalCurrentLiabilities": 100,
-                },
-                {
-                    "totalAssets": 400,
-                    "totalLiabilities": 120,
-                    "totalDebt": 120,
-                    "totalCurrentAssets": 150,
-                    "totalCurrentLiabilities": 80,
-                },
-            ],
-            "cash": [{"operatingCashFlow": 150}, {"operatingCashFlow": 100}],
-        }
+        mock_financials.return_value = _MOCK_FINANCIALS
         self.agent.fmp_key = "MOCK_KEY"
 
         _, _, is_deep, reason, f_score = await self.agent.evaluate_deep_health("NVDA")
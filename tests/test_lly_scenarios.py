@@ -0,0 +1,104 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure bot directory is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from bot.signal_agent import SignalAgent
+
+# LLY snapshot from the live cycle these scenarios were reproduced from
+BASE_MARKET_DATA = {
+    "ticker": "LLY",
+    "current_price": 1009.52,
+    "sma_20": 1000,
+    "sma_50": 1000,
+    "bb_upper": 1100,
+    "bb_lower": 900,
+    "sentiment_score": 0.35,
+    "is_healthy": True,
+    "health_reason": "test",
+    "is_deep_healthy": True,
+    "deep_health_reason": "test",
+    "f_score": 8,
+    "prediction_confidence": 85,
+    "is_low_exposure": False,
+    "band_width": 0.091,
+    "vix": 15.0,
+    "volume": 0,
+    "avg_volume": 1000000,
+    "days_to_earnings": 10,
+    "rsi": 50.0,
+    "qty": 0.0,
+    "holding_value": 0.0,
+    "avg_price": 0.0,
+    "hwm": 0.0,
+}
+
+# (name, overrides, expected action, expected technical signal)
+SCENARIOS = [
+    (
+        "low_exposure_star",
+        {"sentiment_score": 0.40, "is_low_exposure": True, "band_width": 0.094},
+        "IDLE",
+        "STAR_NEUTRAL",
+    ),
+    (
+        "unranked_low_exposure",
+        {"prediction_confidence": 0, "is_low_exposure": True},
+        "IDLE",
+        "NEUTRAL",
+    ),
+    ("unranked", {"prediction_confidence": 0}, "IDLE", "NEUTRAL"),
+    ("ranked_live_metrics", {}, "IDLE", "STAR_NEUTRAL"),
+    (
+        "oversold_low_exposure",
+        {
+            "current_price": 895.0,
+            "rsi": 28.0,
+            "sentiment_score": 0.45,
+            "is_low_exposure": True,
+        },
+        "BUY",
+        "STAR_BUY",
+    ),
+    (
+        "strong_sentiment_star",
+        {"sentiment_score": 0.55, "is_low_exposure": True},
+        "BUY",
+        "STAR_PROACTIVE_STAR_ENTRY",
+    ),
+    (
+        "oversold_into_earnings",
+        {
+            "current_price": 895.0,
+            "rsi": 28.0,
+            "sentiment_score": 0.45,
+            "is_low_exposure": True,
+            "days_to_earnings": 2,
+        },
+        "IDLE",
+        "STAR_SKIP_EARNINGS_AVOIDANCE_2D",
+    ),
+]
+
+
+class TestLLYScenarios(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.agent = SignalAgent(hurdle_rate=0.015, vol_threshold=0.35)
+        cls.agent.is_market_open = MagicMock(return_value=True)
+
+    def test_lly_scenarios(self):
+        """Test the LLY reproductions that used to live in debug_lly*.py."""
+        for name, overrides, action, technical in SCENARIOS:
+            with self.subTest(name):
+                market_data = {**BASE_MARKET_DATA, **overrides}
+                sig = self.agent.evaluate_strategy(market_data, force_eval=True)
+                self.assertEqual(sig["action"], action)
+                self.assertEqual(sig["meta"]["technical"], technical)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import sys
 import unittest
 from unittest.mock import MagicMock, patch
 import os
+from types import SimpleNamespace
 
 # Mock dependencies
 sys.modules["alpaca"] = MagicMock()
@@ -13,12 +14,32 @@ sys.modules["alpaca.trading.enums"] = MagicMock()
 # Ensure bot directory is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 
+from google.cloud import bigquery
+
 from bot.portfolio_reconciler import PortfolioReconciler
 
+# Closed Alpaca orders, built once; sync_executions only reads these attributes
+_FILLED_ORDER = SimpleNamespace(
+    id="order_123",
+    status="filled",
+    filled_avg_price=100.0,
+    filled_qty=10,
+    symbol="AAPL",
+)
+_UNPRICED_ORDER = SimpleNamespace(
+    id="order_456",
+    status="filled",
+    filled_avg_price=None,
+    filled_qty=5,
+    symbol="TSLA",
+)
+
 
 class TestPortfolioReconcilerSync(unittest.TestCase):
     def setUp(self):
-        self.mock_bq = MagicMock()
+        # spec= restricts the mock to real Client attributes, so a typo'd method
+        # fails loudly instead of silently returning a child mock
+        self.mock_bq = MagicMock(spec=bigquery.Client)
         self.reconciler = PortfolioReconciler("test-project", self.mock_bq)
         # Mock Alpaca client
         self.reconciler.trading_client = MagicMock()
@@ -26,14 +47,7 @@ class TestPortfolioReconcilerSync(unittest.TestCase):
     def test_sync_executions_handles_streaming_buffer_error(self):
         """Test that streaming buffer error is swallowed and logged as info."""
         # 1. Mock Alpaca orders
-        mock_order = MagicMock()
-        mock_order.id = "order_123"
-        mock_order.status = "filled"
-        mock_order.filled_avg_price = 100.0
-        mock_order.filled_qty = 10
-        mock_order.symbol = "AAPL"
-
-        self.reconciler.trading_client.get_orders.return_value = [mock_order]
+        self.reconciler.trading_client.get_orders.return_value = [_FILLED_ORDER]
 
         # 2. Mock BQ exception
         # We need to simulate the "streaming buffer" message in the exception string
@@ -55,11 +69,7 @@ class TestPortfolioReconcilerSync(unittest.TestCase):
 
     def test_sync_executions_other_error(self):
         """Test that other BQ errors are still logged as errors (re-raised or logged)."""
-        mock_order = MagicMock()
-        mock_order.id = "order_456"
-        mock_order.status = "filled"
-        mock_order.symbol = "TSLA"
-        self.reconciler.trading_client.get_orders.return_value = [mock_order]
+        self.reconciler.trading_client.get_orders.return_value = [_UNPRICED_ORDER]
 
         self.mock_bq.query.side_effect = Exception("Table not found")
 
@@ -2,21 +2,27 @@ import sys
 import os
 import unittest
 from unittest.mock import MagicMock, patch
+from datetime import datetime
 from decimal import Decimal
 
 # Ensure bot directory is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 
-from bot.signal_agent import SignalAgent
+from bot.signal_agent import SignalAgent, _NY
 
 
 class TestSignalAgent(unittest.TestCase):
-    def setUp(self):
-        # Initialize with standard thresholds
-        self.agent = SignalAgent(vol_threshold=0.35, hurdle_rate=0.015)
+    @classmethod
+    def setUpClass(cls):
+        # Initialize once with standard thresholds; the strategy methods
+        # under test don't mutate agent state, so every test can share it.
+        cls.agent = SignalAgent(vol_threshold=0.35, hurdle_rate=0.015)
         # Mock is_market_open to True for deterministic testing
-        self.agent.is_market_open = MagicMock(return_value=True)
-        # Mock should_exit to HOLD by default so it doesn't interfere
+        cls.agent.is_market_open = MagicMock(return_value=True)
+
+    def setUp(self):
+        # Mock should_exit to HOLD by default so it doesn't interfere.
+        # Reset per test because test_strategic_exit overrides it.
         self.agent.should_exit = MagicMock(return_value="HOLD")
 
     def test_evaluate_bands_buy(self):
@@ -169,6 +175,24 @@ class TestSignalAgent(unittest.TestCase):
         self.assertTrue(decision["meta"]["is_star"])
         self.assertTrue(decision["meta"]["technical"].startswith("STAR_"))
 
+    @patch("bot.signal_agent.datetime")
+    def test_is_market_open_hours(self, mock_dt):
+        """Test the weekday, holiday and 9:30-16:00 New York session checks."""
+        agent = SignalAgent()
+        cases = [
+            (datetime(2026, 3, 10, 9, 29), False),  # Tuesday, pre-open
+            (datetime(2026, 3, 10, 9, 30), True),
+            (datetime(2026, 3, 10, 15, 59), True),
+            (datetime(2026, 3, 10, 16, 0), False),
+            (datetime(2026, 3, 14, 11, 0), False),  # Saturday
+            (datetime(2026, 4, 3, 11, 0), False),  # Good Friday
+        ]
+        for naive, expected in cases:
+            with self.subTest(now=naive):
+                mock_dt.now.return_value = naive.replace(tzinfo=_NY)
+                self.assertEqual(agent.is_market_open(), expected)
+                mock_dt.now.assert_called_with(_NY)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,375 @@
+import sys
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import orjson
+import requests
+from google.api_core import exceptions
+
+# Ensure bot directory is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from bot import telemetry
+
+
+def sent_batches(client):
+    """Decodes the insertAll requests a mock client received: [(path, rows)]."""
+    return [
+        (c.kwargs["path"], [r["json"] for r in orjson.loads(c.kwargs["data"])["rows"]])
+        for c in client._connection.api_request.call_args_list
+    ]
+
+
+class TestTelemetryQueue(unittest.TestCase):
+    def setUp(self):
+        # Keep the background worker out of the way so draining is deterministic
+        self.worker_patcher = patch.object(telemetry, "_ensure_worker")
+        self.worker_patcher.start()
+        self.client = MagicMock()
+        self.client._connection.api_request.return_value = {}
+        self.client.project = "test-project"
+        self.table_id = "test-project.trading_data.watchlist_logs"
+        self.path = "/projects/test-project/datasets/trading_data/tables/watchlist_logs"
+
+    def tearDown(self):
+        telemetry.flush_telemetry()
+        self.worker_patcher.stop()
+
+    def test_rows_are_queued_not_inserted_inline(self):
+        """Test that log_watchlist_data never hits BigQuery on the caller's thread."""
+        for ticker in ("NVDA", "AAPL", "MSFT"):
+            telemetry.log_watchlist_data(self.client, self.table_id, ticker, 100.0)
+
+        self.client._connection.api_request.assert_not_called()
+
+        telemetry.flush_telemetry()
+
+        [(path, rows)] = sent_batches(self.client)
+        self.assertEqual(path, self.path + "/insertAll")
+        self.assertEqual([r["ticker"] for r in rows], ["NVDA", "AAPL", "MSFT"])
+        self.assertTrue(all(r["timestamp"].endswith("Z") for r in rows))
+        self.assertTrue(telemetry._bq_queue.empty())
+
+    def test_watchlist_rows_keep_their_observation_time(self):
+        """Test that rows are stamped when logged, not when the worker ships them."""
+        before = datetime.now(timezone.utc)
+        telemetry.log_watchlist_data(self.client, self.table_id, "NVDA", 100.0)
+        after = datetime.now(timezone.utc)
+
+        [(_, _, row, _)] = list(telemetry._bq_queue.queue)
+        self.assertTrue(before <= row["timestamp"] <= after)
+
+    def test_drain_is_capped_at_batch_size(self):
+        """Test that one drain never pulls more than _MAX_BATCH rows."""
+        with patch.object(telemetry, "_MAX_BATCH", 2):
+            for ticker in ("NVDA", "AAPL", "MSFT"):
+                telemetry.log_watchlist_data(self.client, self.table_id, ticker, 1.0)
+            telemetry.flush_telemetry()
+
+        sizes = [len(rows) for _, rows in sent_batches(self.client)]
+        self.assertEqual(sizes, [2, 1])
+
+    def test_rows_are_grouped_per_table(self):
+        """Test that a mixed batch issues one insert per destination table."""
+        telemetry.log_watchlist_data(self.client, self.table_id, "NVDA", 100.0)
+        telemetry.log_performance(
+            self.client,
+            "test-project.trading_data.performance_logs",
+            {"total_equity": 1.0},
+        )
+        telemetry.flush_telemetry()
+
+        paths = [path for path, _ in sent_batches(self.client)]
+        self.assertEqual(
+            paths,
+            [
+                self.path + "/insertAll",
+                "/projects/test-project/datasets/trading_data/tables/performance_logs/insertAll",
+            ],
+        )
+
+    def test_row_templates_are_not_mutated(self):
+        """Test that producers copy the row template rather than mutating it."""
+        telemetry.log_watchlist_data(
+            self.client, self.table_id, "NVDA", 100.0, 0.5, rsi=40.0
+        )
+        telemetry.log_performance(self.client, "p.t.perf", {"total_equity": 5.0})
+        telemetry.flush_telemetry()
+
+        self.assertIsNone(telemetry._PERF_ROW_TEMPLATE["timestamp"])
+        self.assertEqual(telemetry._PERF_ROW_TEMPLATE["paper_equity"], 0.0)
+
+        wl_row = sent_batches(self.client)[0][1][0]
+        self.assertEqual(wl_row["rsi"], 40.0)
+        self.assertEqual(wl_row["sentiment_score"], 0.5)
+        self.assertIsNone(wl_row["sma_20"])
+
+    def test_numeric_fields_are_plain_python_types(self):
+        """Test that non-native inputs are coerced and floats pass through as-is."""
+        price = 101.5
+        self.assertIs(telemetry._maybe_float(price), price)
+        self.assertIsNone(telemetry._maybe_int(None))
+
+        telemetry.log_watchlist_data(
+            self.client, self.table_id, "NVDA", price, f_score="7", conviction=80.0
+        )
+        telemetry.flush_telemetry()
+
+        row = sent_batches(self.client)[0][1][0]
+        self.assertEqual(row["price"], price)
+        self.assertEqual(row["f_score"], 7)
+        self.assertIs(type(row["conviction"]), int)
+        self.assertEqual(row["sentiment_score"], 0.0)
+
+    def test_oversized_flush_is_chunked(self):
+        """Test that a flush never sends more than _MAX_BATCH rows per request."""
+        rows = [{"ticker": str(i)} for i in range(5)]
+        with patch.object(telemetry, "_MAX_BATCH", 2):
+            telemetry._insert_batched(self.client, self.table_id, rows)
+
+        sizes = [len(rows) for _, rows in sent_batches(self.client)]
+        self.assertEqual(sizes, [2, 2, 1])
+
+    def test_empty_inputs_are_skipped(self):
+        """Test that blank tickers, zero prices and zero equity never queue a row."""
+        with self.assertLogs("master-log", level="WARNING") as cm:
+            telemetry.log_watchlist_data(self.client, self.table_id, "", 100.0)
+            telemetry.log_watchlist_data(self.client, self.table_id, "NVDA", 0)
+            telemetry.log_performance(self.client, "p.d.perf", {"total_equity": 0})
+
+        self.assertEqual(len(cm.records), 3)
+        self.assertTrue(telemetry._bq_queue.empty())
+
+    def test_macro_row_follows_schema(self):
+        """Test that macro rows are cast per _MACRO_SCHEMA with falsy defaults."""
+        macro = {
+            "indices": {"vix": "18.5", "spy_perf": None},
+            "rates": {"10Y": 4.2, "source": "FMP"},
+            "calendar": [{"event": "CPI"}],
+        }
+        telemetry.log_macro_snapshot(self.client, "test-project", macro)
+        telemetry.flush_telemetry()
+
+        row = sent_batches(self.client)[0][1][0]
+        self.assertEqual(row["vix"], 18.5)
+        self.assertEqual(row["spy_perf"], 0.0)
+        self.assertEqual(row["qqq_perf"], 0.0)
+        self.assertEqual(row["yield_10y"], 4.2)
+        self.assertEqual(row["yield_2y"], 0.0)
+        self.assertEqual(row["yield_source"], "FMP")
+        self.assertEqual(orjson.loads(row["calendar_json"]), [{"event": "CPI"}])
+
+    def test_insert_errors_are_mapped(self):
+        """Test that insertAll errors come back in insert_rows_json's shape."""
+        self.client._connection.api_request.return_value = {
+            "insertErrors": [{"index": "1", "errors": [{"reason": "invalid"}]}]
+        }
+        errors = telemetry._fast_insert_rows_json(
+            self.client, self.table_id, [{"a": 1}, {"a": 2}]
+        )
+        self.assertEqual(errors, [{"index": 1, "errors": [{"reason": "invalid"}]}])
+
+    def test_two_part_table_id_uses_client_project(self):
+        """Test that dataset.table ids resolve against the client's project."""
+        telemetry._fast_insert_rows_json(
+            self.client, "trading_data.watchlist_logs", [{"a": 1}]
+        )
+        self.assertEqual(sent_batches(self.client)[0][0], self.path + "/insertAll")
+
+    def test_domain_scoped_project_is_parsed(self):
+        """Test that a domain-scoped project id keeps its ':' segment intact."""
+        telemetry._fast_insert_rows_json(
+            self.client, "example.com:proj.trading_data.watchlist_logs", [{"a": 1}]
+        )
+        self.assertEqual(
+            sent_batches(self.client)[0][0],
+            "/projects/example.com:proj/datasets/trading_data/tables/"
+            "watchlist_logs/insertAll",
+        )
+
+    def test_rows_carry_insert_ids(self):
+        """Test that queued rows are sent with a per-ticker insertId."""
+        telemetry.log_watchlist_data(self.client, self.table_id, "NVDA", 100.0)
+        telemetry.flush_telemetry()
+
+        body = orjson.loads(
+            self.client._connection.api_request.call_args.kwargs["data"]
+        )
+        self.assertTrue(body["rows"][0]["insertId"].startswith("NVDA:"))
+
+    def test_execution_rows_ship_with_the_batch(self):
+        """Test that execution rows are queued and keyed by execution_id."""
+        row = {"timestamp": "2026-01-01T00:00:00+00:00", "execution_id": "exec-1-NVDA"}
+        telemetry.log_execution(self.client, "trading_data.executions", row)
+        self.client._connection.api_request.assert_not_called()
+
+        telemetry.flush_telemetry()
+
+        [(path, rows)] = sent_batches(self.client)
+        self.assertTrue(path.endswith("/tables/executions/insertAll"))
+        self.assertEqual(rows, [row])
+        body = orjson.loads(
+            self.client._connection.api_request.call_args.kwargs["data"]
+        )
+        self.assertTrue(body["rows"][0]["insertId"].startswith("exec-1-NVDA:"))
+
+    @patch.object(
+        telemetry,
+        "_INSERT_RETRY",
+        telemetry._INSERT_RETRY.with_delay(initial=0.001, maximum=0.001),
+    )
+    def test_transient_failures_are_retried(self):
+        """Test that 5xx and connection resets are retried when rows carry ids."""
+        for error in (
+            exceptions.ServiceUnavailable("Service Unavailable"),
+            exceptions.BadGateway("Bad Gateway"),
+            requests.exceptions.ConnectionError("Connection reset by peer"),
+        ):
+            with self.subTest(error=type(error).__name__):
+                api_request = self.client._connection.api_request
+                api_request.reset_mock()
+                api_request.side_effect = [error, {}]
+
+                errors = telemetry._insert_batched(
+                    self.client, self.table_id, [{"a": 1}], ["id-1"]
+                )
+
+                self.assertEqual(errors, [])
+                self.assertEqual(api_request.call_count, 2)
+
+    def test_rows_without_ids_are_not_retried(self):
+        """Test that a chunk without insertIds fails fast instead of duplicating."""
+        self.client._connection.api_request.side_effect = exceptions.TooManyRequests(
+            "Too Many Requests"
+        )
+
+        with self.assertRaises(exceptions.TooManyRequests):
+            telemetry._insert_batched(self.client, self.table_id, [{"a": 1}])
+
+        self.client._connection.api_request.assert_called_once()
+
+    def test_flush_error_does_not_raise(self):
+        """Test that a BigQuery failure during flush doesn't crash the cycle."""
+        self.client._connection.api_request.side_effect = Exception("Not found")
+        telemetry.log_watchlist_data(self.client, self.table_id, "NVDA", 100.0)
+
+        with self.assertLogs("master-log", level="ERROR") as cm:
+            try:
+                telemetry.flush_telemetry()
+            except Exception as e:
+                self.fail(f"flush_telemetry raised exception unexpectedly: {e}")
+
+        # Reported as one JSON line through the master logger, not a bare print
+        self.assertIn("Critical Telemetry Failure", cm.records[0].getMessage())
+
+    def test_full_queue_drops_row(self):
+        """Test that a saturated queue drops rows instead of blocking the caller."""
+        with patch.object(telemetry, "_bq_queue", telemetry.queue.Queue(maxsize=1)):
+            telemetry.log_watchlist_data(self.client, self.table_id, "NVDA", 1.0)
+            dropped = telemetry._dropped_rows
+            with self.assertLogs("master-log", level="WARNING") as cm:
+                telemetry.log_watchlist_data(self.client, self.table_id, "AAPL", 2.0)
+            self.assertEqual(telemetry._dropped_rows, dropped + 1)
+            self.assertIn("dropped row", cm.records[0].getMessage())
+
+    def test_flush_gives_up_on_a_stuck_batch(self):
+        """Test that flush_telemetry returns after its timeout with work in flight."""
+        with patch.object(telemetry, "_bq_queue", telemetry.queue.Queue()):
+            telemetry._bq_queue.put_nowait(None)
+            telemetry._bq_queue.get_nowait()  # taken by a worker, never task_done
+
+            with self.assertLogs("master-log", level="WARNING") as cm:
+                telemetry.flush_telemetry(timeout=0.01)
+
+        self.assertIn("timed out", cm.records[0].getMessage())
+
+
+class TestTelemetryWorker(unittest.TestCase):
+    def test_worker_ships_rows_in_background(self):
+        """Test that the background worker delivers rows without an explicit drain."""
+        client = MagicMock()
+        client._connection.api_request.return_value = {}
+
+        telemetry.log_watchlist_data(client, "p.d.watchlist_logs", "NVDA", 100.0)
+        telemetry._bq_queue.join()
+
+        client._connection.api_request.assert_called_once()
+
+
+class TestSharedClient(unittest.TestCase):
+    def setUp(self):
+        telemetry.get_client.cache_clear()
+
+    def tearDown(self):
+        telemetry.get_client.cache_clear()
+
+    @patch("google.cloud.bigquery.Client")
+    def test_client_is_built_once(self, mock_bq_client):
+        """Test that repeated telemetry calls reuse one lazily-built client."""
+        mock_bq_client.return_value._connection.api_request.return_value = {}
+        metrics = {"total_equity": 1000.0}
+
+        telemetry.log_performance(None, "p.d.performance_logs", metrics)
+        telemetry.log_performance(None, "p.d.performance_logs", metrics)
+        telemetry.flush_telemetry()
+
+        mock_bq_client.assert_called_once()
+        inserted = sent_batches(mock_bq_client.return_value)
+        self.assertEqual(sum(len(rows) for _, rows in inserted), 2)
+
+
+class TestLogAudit(unittest.TestCase):
+    def test_log_audit_goes_through_master_logger(self):
+        """Test that log_audit is encoded by the logger, not a second json path."""
+        with self.assertLogs("master-log", level="WARNING") as cm:
+            telemetry.log_audit(
+                "WARN", "Skipping row for %s", "NVDA", extra={"ticker": "NVDA"}
+            )
+
+        record = cm.records[0]
+        self.assertEqual(record.levelname, "WARNING")
+        self.assertEqual(record.getMessage(), "Skipping row for NVDA")
+        self.assertEqual(record.event, "AUDIT")
+        self.assertEqual(record.details, {"ticker": "NVDA"})
+
+    def test_log_audit_skips_formatting_below_threshold(self):
+        """Test that filtered-out audit lines never interpolate their args."""
+        arg = MagicMock()
+        telemetry.log_audit("DEBUG", "Cycle complete for %s", arg)
+        arg.__str__.assert_not_called()
+
+    def test_handler_is_installed_once(self):
+        """Test that re-running the handler setup keeps a single JSON handler."""
+        telemetry._install_handler()
+        telemetry._install_handler()
+
+        names = [h.get_name() for h in telemetry.logger.handlers]
+        self.assertEqual(names.count(telemetry._HANDLER_NAME), 1)
+        [handler] = [
+            h
+            for h in telemetry.logger.handlers
+            if h.get_name() == telemetry._HANDLER_NAME
+        ]
+        self.assertIs(handler.lock, telemetry._stdout_lock)
+        self.assertFalse(telemetry.logger.propagate)
+
+
+class TestLogDecision(unittest.TestCase):
+    @patch.object(telemetry, "_stdout")
+    def test_decision_is_a_single_write(self, mock_stdout):
+        """Test that a decision is emitted as one JSON line carrying the message."""
+        telemetry.log_decision("NVDA", "BUY", "Breakout", {"qty": 3})
+
+        mock_stdout.buffer.write.assert_called_once()
+        line = mock_stdout.buffer.write.call_args[0][0]
+        self.assertTrue(line.endswith(b"\n"))
+        payload = orjson.loads(line)
+        self.assertEqual(payload["message"], "[DECISION] 🚀 BUY NVDA: Breakout")
+        self.assertEqual(payload["details"], {"qty": 3})
+        self.assertEqual(payload["event"], "TRADING_DECISION")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import sys
+import os
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+from google.api_core.exceptions import BadRequest
+import vertexai
+from vertexai.generative_models import GenerativeModel
+
+# Ensure bot directory is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from bot.ticker_ranker import TickerRanker, _GENERATION_CONFIG
+
+
+def make_ranker(bq_client):
+    """Builds a TickerRanker with its Gemini/feedback collaborators mocked."""
+    with patch("bot.ticker_ranker.SentimentAnalyzer"), patch(
+        "bot.ticker_ranker.FeedbackAgent"
+    ), patch.dict(os.environ, {"EXCHANGE_API_KEY": ""}):
+        return TickerRanker("test-project", bq_client)
+
+
+class TestTickerRanker(unittest.TestCase):
+    def setUp(self):
+        self.mock_bq = MagicMock()
+        self.mock_bq.insert_rows_json.return_value = []
+        self.mock_bq.load_table_from_file.return_value.errors = None
+        self.ranker = make_ranker(self.mock_bq)
+
+    @staticmethod
+    def _results(n):
+        return [
+            {"ticker": f"T{i}", "sentiment": 0.1, "confidence": 50, "reason": "ok"}
+            for i in range(n)
+        ]
+
+    def test_small_batches_are_streamed(self):
+        """Test that a handful of rankings still go through insert_rows_json."""
+        self.ranker.log_ranking_to_bq(self._results(2))
+
+        self.mock_bq.insert_rows_json.assert_called_once()
+        self.mock_bq.load_table_from_file.assert_not_called()
+
+    def test_large_batches_use_one_load_job(self):
+        """Test that a full ranking run is written with a single NDJSON load job."""
+        self.ranker.log_ranking_to_bq(self._results(6))
+
+        self.mock_bq.insert_rows_json.assert_not_called()
+        self.mock_bq.load_table_from_file.assert_called_once()
+        buf, table_id = self.mock_bq.load_table_from_file.call_args[0]
+        self.assertEqual(table_id, "test-project.trading_data.ticker_rankings")
+        rows = [orjson.loads(line) for line in buf.getvalue().splitlines()]
+        self.assertEqual([r["ticker"] for r in rows], [f"T{i}" for i in range(6)])
+        self.mock_bq.load_table_from_file.return_value.result.assert_called_once()
+
+    def test_failed_load_job_is_logged_not_raised(self):
+        """Test that a load job failure is reported like a streaming error."""
+        self.mock_bq.load_table_from_file.return_value.result.side_effect = BadRequest(
+            "Error while reading data"
+        )
+
+        with self.assertLogs("TickerRanker", level="ERROR") as cm:
+            self.ranker.log_ranking_to_bq(self._results(6))
+
+        self.assertIn("BQ Insert Errors", cm.output[0])
+        self.assertIn("Error while reading data", cm.output[0])
+
+    def test_empty_results_skip_bigquery(self):
+        """Test that no BigQuery call is made when there is nothing to log."""
+        self.ranker.log_ranking_to_bq([])
+
+        self.mock_bq.insert_rows_json.assert_not_called()
+        self.mock_bq.load_table_from_file.assert_not_called()
+
+
+class TestAnalyzeTickers(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.ranker = make_ranker(MagicMock())
+        self.model = self.ranker.sentiment_analyzer.model
+        self.headlines = {"NVDA": ["NVDA beats estimates"], "AAPL": ["AAPL flat"]}
+
+    async def test_one_call_ranks_every_ticker(self):
+        """Test that all tickers share one JSON-schema Gemini call."""
+        self.model.generate_content.return_value.text = orjson.dumps(
+            [
+                {"ticker": "NVDA", "score": 0.65, "confidence": 80, "reason": "Beat."},
+                {"ticker": "AAPL", "score": 0.0, "confidence": 10, "reason": "Flat."},
+            ]
+        ).decode()
+
+        results = await self.ranker.analyze_tickers(self.headlines, "LESSON")
+
+        self.model.generate_content.assert_called_once()
+        self.assertEqual(results["NVDA"]["sentiment"], 0.65)
+        self.assertEqual(results["NVDA"]["confidence"], 80)
+        self.assertEqual(results["AAPL"]["reason"], "Flat.")
+        prompt = self.model.generate_content.call_args[0][0]
+        self.assertIn("LESSON", prompt)
+        self.assertIn("NVDA beats estimates", prompt)
+        config = self.model.generate_content.call_args.kwargs["generation_config"]
+        self.assertIs(config, _GENERATION_CONFIG)
+
+    async def test_missing_or_bad_entries_fall_back(self):
+        """Test that tickers Gemini omits or mangles get the failure result."""
+        self.model.generate_content.return_value.text = orjson.dumps(
+            [
+                {"ticker": "NVDA", "score": "high", "confidence": 80, "reason": "?"},
+                {"ticker": "MSFT", "score": 0.5, "confidence": 50, "reason": "x"},
+            ]
+        ).decode()
+
+        results = await self.ranker.analyze_tickers(self.headlines)
+
+        self.assertEqual(set(results), {"NVDA", "AAPL"})
+        for res in results.values():
+            self.assertEqual(res["confidence"], 0)
+            self.assertEqual(res["reason"], "AI Analysis failed.")
+
+    async def test_blank_headlines_skip_gemini(self):
+        """Test that tickers without any headline text never reach Gemini."""
+        self.ranker.feedback_agent.get_recent_lessons = AsyncMock(return_value="")
+        self.ranker.fetch_overnight_news = AsyncMock(
+            return_value=[{"headline": ""}, {}]
+        )
+        self.ranker.log_ranking_to_bq = MagicMock()
+
+        results = await self.ranker.rank_and_log(["NVDA"])
+
+        self.assertEqual(results[0]["reason"], "No overnight news found.")
+        self.model.generate_content.assert_not_called()
+
+
+class TestGenerationConfig(unittest.TestCase):
+    def test_config_builds_a_real_request(self):
+        """Test that the SDK turns the structured-output config into a request."""
+        vertexai.init(project="test-project", location="us-central1")
+        model = GenerativeModel("gemini-2.5-flash")
+
+        request = model._prepare_request(
+            contents="hi", generation_config=_GENERATION_CONFIG
+        )
+
+        config = request.generation_config
+        self.assertEqual(config.response_mime_type, "application/json")
+        self.assertEqual(config.response_schema.type_.name, "ARRAY")
+        self.assertEqual(config.response_schema.items.type_.name, "OBJECT")
+
+
+class TestFetchOvernightNews(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.ranker = make_ranker(MagicMock())
+        self.ranker.finnhub_key = "test-key"
+        self.session = MagicMock()
+        self.response = self.session.get.return_value.__aenter__.return_value
+        self.response.status = 200
+        self.response.raise_for_status = MagicMock()
+
+    async def test_news_comes_from_shared_session(self):
+        """Test that news is fetched over the caller's pooled HTTP session."""
+        self.response.json = AsyncMock(return_value=[{"headline": "NVDA up"}])
+
+        news = await self.ranker.fetch_overnight_news("NVDA", self.session)
+
+        self.assertEqual(news, [{"headline": "NVDA up"}])
+        url = self.session.get.call_args[0][0]
+        params = self.session.get.call_args.kwargs["params"]
+        self.assertEqual(url, "https://finnhub.io/api/v1/company-news")
+        self.assertEqual(params["symbol"], "NVDA")
+        self.assertEqual(params["token"], "test-key")
+
+    async def test_rate_limit_returns_no_news(self):
+        """Test that a 429 from Finnhub yields an empty list, not an error."""
+        self.response.status = 429
+
+        self.assertEqual(
+            await self.ranker.fetch_overnight_news("NVDA", self.session), []
+        )
+
+    @patch("bot.ticker_ranker.aiohttp.ClientSession")
+    async def test_rank_and_log_shares_one_session(self, mock_session_cls):
+        """Test that every ticker's news in a run is fetched with the same session."""
+        session = mock_session_cls.return_value.__aenter__.return_value
+        self.ranker.feedback_agent.get_recent_lessons = AsyncMock(return_value="")
+        self.ranker.fetch_overnight_news = AsyncMock(return_value=[])
+        self.ranker.log_ranking_to_bq = MagicMock()
+
+        await self.ranker.rank_and_log(["NVDA", "AAPL"])
+
+        mock_session_cls.assert_called_once()
+        sessions = {c.args[1] for c in self.ranker.fetch_overnight_news.call_args_list}
+        self.assertEqual(sessions, {session})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+from unittest.mock import AsyncMock, patch
+
+# Ensure bot directory is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from bot import verification
+
+
+class TestGetHardProof(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        verification._client.cache_clear()
+
+    def tearDown(self):
+        verification._client.cache_clear()
+
+    @patch("bot.verification.finnhub.Client")
+    async def test_positive_conviction_score(self, mock_client_cls):
+        """Test that positive MSPR plus recent filings produce a proof score."""
+        client = mock_client_cls.return_value
+        client.stock_insider_sentiment.return_value = {
+            "data": [{"mspr": 20.0}, {"mspr": 10.0}]
+        }
+        client.filings.return_value = [{"form": "8-K"}, {"form": "4"}, {"form": "10-Q"}]
+
+        score = await verification.get_hard_proof("NVDA")
+
+        self.assertEqual(score, 5.0)
+        client.stock_insider_sentiment.assert_called_once()
+        client.filings.assert_called_once()
+
+    @patch("bot.verification.asyncio.sleep", new_callable=AsyncMock)
+    @patch("bot.verification.finnhub.Client")
+    async def test_rate_limit_backs_off_without_blocking(
+        self, mock_client_cls, mock_sleep
+    ):
+        """Test that a 429 retries after an asyncio.sleep backoff."""
+        client = mock_client_cls.return_value
+        client.stock_insider_sentiment.side_effect = [
+            Exception("429 Too Many Requests"),
+            {"data": [{"mspr": -60.0}]},
+        ]
+        client.filings.return_value = []
+
+        score = await verification.get_hard_proof("NVDA")
+
+        self.assertEqual(score, -1.0)
+        mock_sleep.assert_awaited_once_with(2)
+
+    @patch("bot.verification.finnhub.Client")
+    async def test_other_errors_return_neutral(self, mock_client_cls):
+        """Test that a non rate-limit failure returns 0 without retrying."""
+        client = mock_client_cls.return_value
+        client.stock_insider_sentiment.side_effect = Exception("boom")
+        client.filings.return_value = []
+
+        self.assertEqual(await verification.get_hard_proof("NVDA"), 0)
+        client.stock_insider_sentiment.assert_called_once()
+
+    @patch("bot.verification.finnhub.Client")
+    async def test_client_is_reused_across_calls(self, mock_client_cls):
+        """Test that repeated lookups share one Finnhub client."""
+        client = mock_client_cls.return_value
+        client.stock_insider_sentiment.return_value = {"data": []}
+        client.filings.return_value = []
+
+        await verification.get_hard_proof("NVDA")
+        await verification.get_hard_proof("AAPL")
+
+        mock_client_cls.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
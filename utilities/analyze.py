@@ -10,7 +10,7 @@ FROM `utopian-calling-429014-r9.trading_data.executions`
 WHERE timestamp > TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 24 HOUR)
 ORDER BY timestamp ASC
 """
-for row in client.query(q_exec).result():
+for row in client.query(q_exec).result(page_size=1000):
     print(
         f"[{row.timestamp}] {row.action} {row.quantity}x {row.ticker} @ ${row.price} - Status: {row.status} (Reason: {row.reason})"
     )
@@ -22,7 +22,8 @@ SELECT MIN(timestamp) as start_time, MAX(timestamp) as end_time,
 FROM `utopian-calling-429014-r9.trading_data.performance_logs`
 WHERE timestamp > TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 24 HOUR)
 """
-for row in client.query(q_perf).result():
+# Single-row aggregate: jobs.query answers inline, no separate getQueryResults poll
+for row in client.query_and_wait(q_perf):
     print(f"Start: {row.start_time}")
     print(f"End: {row.end_time}")
     print(f"Lowest: ${row.lowest}")
@@ -8,8 +8,15 @@ table_id = f"{project_id}.trading_data.portfolio"
 print(f"Checking table: {table_id}")
 
 try:
-    query = f"SELECT * FROM `{table_id}`"
-    results = client.query(query).result()
+    query = f"""
+        SELECT asset_name, holdings, cash_balance, avg_price, last_updated
+        FROM `{table_id}`
+    """
+    # The portfolio table is tiny; anything bigger than this is a mistake
+    job_config = bigquery.QueryJobConfig(
+        use_query_cache=True, maximum_bytes_billed=100 * 1024 * 1024
+    )
+    results = client.query(query, job_config=job_config).result()
 
     print(
         f"{'Asset':<10} | {'Holdings':<10} | {'Cash':<15} | {'Avg Price':<10} | {'Last Updated'}"
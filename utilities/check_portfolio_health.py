@@ -16,6 +16,8 @@ from google.cloud import bigquery
 from bot.fundamental_agent import FundamentalAgent
 
 PROJECT_ID = os.getenv("PROJECT_ID", "utopian-calling-429014-r9")
+# Concurrent deep-health evaluations
+_CONCURRENCY = 10
 
 
 async def audit_portfolio():
@@ -24,7 +26,7 @@ async def audit_portfolio():
     # 1. Get Holdings
     client = bigquery.Client(project=PROJECT_ID)
     query = f"""
-        SELECT asset_name as ticker, holdings, avg_price 
+        SELECT asset_name as ticker
         FROM `{PROJECT_ID}.trading_data.portfolio`
         WHERE holdings > 0
     """
@@ -44,14 +46,29 @@ async def audit_portfolio():
     print(f"{'TICKER':<10} | {'HEALTHY':<8} | {'F-SCORE':<8} | {'REASON'}")
     print("-" * 60)
 
-    for ticker in holdings:
-        is_deep, reason, f_score = await agent.evaluate_deep_health(ticker)
-
-        status = "✅ PASS" if (is_deep and f_score >= 5) else "❌ FAIL"
-        if f_score < 5:
-            status = "❌ WEAK"
-        if not is_deep:
-            status = "❌ BAD"
+    # Fetch every position concurrently; the semaphore keeps the burst under
+    # FMP's rate limit
+    sem = asyncio.Semaphore(_CONCURRENCY)
+
+    async def evaluate(ticker):
+        async with sem:
+            return await agent.evaluate_deep_health(ticker)
+
+    evaluations = await asyncio.gather(
+        *(evaluate(t) for t in holdings), return_exceptions=True
+    )
+
+    for ticker, evaluation in zip(holdings, evaluations):
+        if isinstance(evaluation, Exception):
+            status, f_score, reason = "❌ FAIL", 0, f"Error: {evaluation}"
+        else:
+            _, _, is_deep, reason, f_score = evaluation
+
+            status = "✅ PASS" if (is_deep and f_score >= 5) else "❌ FAIL"
+            if f_score < 5:
+                status = "❌ WEAK"
+            if not is_deep:
+                status = "❌ BAD"
 
         print(f"{ticker:<10} | {status:<8} | {f_score:<8} | {reason}")
         results.append((ticker, status, f_score, reason))
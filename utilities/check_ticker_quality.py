@@ -1,5 +1,6 @@
 import asyncio
 import os
+import re
 import sys
 from bot.fundamental_agent import FundamentalAgent
 from bot.telemetry import logger
@@ -9,27 +10,41 @@ import logging
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+_QUALITY_RE = re.compile(r"Quality (\d+)/100")
+# Concurrent deep-health evaluations
+_CONCURRENCY = 10
+
 
 async def check_tickers(tickers):
     agent = FundamentalAgent()
     print(f"{'TICKER':<10} | {'SCORE':<5} | {'RATING':<10} | {'REASON'}")
     print("-" * 60)
 
-    for ticker in tickers:
-        try:
-            is_deep, reason, f_score = await agent.evaluate_deep_health(ticker)
+    # Fetch every ticker concurrently; the semaphore keeps the burst under
+    # FMP's rate limit
+    sem = asyncio.Semaphore(_CONCURRENCY)
+
+    async def evaluate(ticker):
+        async with sem:
+            return await agent.evaluate_deep_health(ticker)
+
+    evaluations = await asyncio.gather(
+        *(evaluate(t) for t in tickers), return_exceptions=True
+    )
 
-            # Extract Quality Score from reason string for display
-            import re
+    for ticker, evaluation in zip(tickers, evaluations):
+        if isinstance(evaluation, Exception):
+            print(f"{ticker:<10} | {'ERR':<5} | {'ERROR':<10} | {str(evaluation)}")
+            continue
+        _, _, is_deep, reason, f_score = evaluation
 
-            q_match = re.search(r"Quality (\d+)/100", reason)
-            q_score = int(q_match.group(1)) if q_match else 0
+        # Extract Quality Score from reason string for display
+        q_match = _QUALITY_RE.search(reason)
+        q_score = int(q_match.group(1)) if q_match else 0
 
-            rating = "✅ BUY" if is_deep else "❌ AVOID"
+        rating = "✅ BUY" if is_deep else "❌ AVOID"
 
-            print(f"{ticker:<10} | {q_score:<5} | {rating:<10} | {reason}")
-        except Exception as e:
-            print(f"{ticker:<10} | {'ERR':<5} | {'ERROR':<10} | {str(e)}")
+        print(f"{ticker:<10} | {q_score:<5} | {rating:<10} | {reason}")
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+import functools
+
 from google.cloud import bigquery
 
 # Force correct project (user's project ID from context)
@@ -6,17 +8,24 @@ DATASET_ID = "trading_processed"
 TABLE_ID = "portfolio"
 
 
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    return bigquery.Client(project=PROJECT_ID)
+
+
 def debug_portfolio():
-    client = bigquery.Client(project=PROJECT_ID)
+    client = _get_client()
     table_ref = f"{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}"
 
     print(f"🔍 Dumping Portfolio Table: {table_ref}")
 
-    query = f"SELECT * FROM `{table_ref}`"
-    results = list(client.query(query).result())
+    # The cash total rides along on every row, so no client-side accumulation
+    query = f"SELECT *, SUM(cash_balance) OVER () AS total_cash FROM `{table_ref}`"
+    results = client.query(query).result()
 
     total_cash = 0.0
-    total_holdings = 0.0
+    # Older portfolio tables predate avg_price; check the result schema once
+    has_avg = any(field.name == "avg_price" for field in results.schema)
 
     print(
         f"{'ASSET':<10} | {'CASH':<15} | {'HOLDINGS':<10} | {'AVG_PRICE':<10} | {'LAST_UPDATED'}"
@@ -26,20 +35,16 @@ def debug_portfolio():
     for row in results:
         t_cash = row.cash_balance
         t_holdings = row.holdings
-        try:
-            t_avg = row.avg_price
-        except Exception:
-            t_avg = None
+        t_avg = row.avg_price if has_avg else None
 
         print(
             f"{row.asset_name:<10} | ${t_cash:,.2f} | {t_holdings:<10} | {t_avg} | {row.last_updated}"
         )
 
-        total_cash += t_cash
-    # we can't sum holdings directly as they are different assets, but good for count
+        total_cash = row.total_cash or 0.0
 
     print("-" * 80)
-    print(f"TOTAL ROW COUNT: {len(results)}")
+    print(f"TOTAL ROW COUNT: {results.total_rows}")
     print(f"TOTAL CASH SUM: ${total_cash:,.2f}")
 
 
@@ -12,10 +12,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import finnhub
-import os
 import time
 import datetime
-import pandas as pd
 
 
 def diagnose():
@@ -46,17 +44,15 @@ def diagnose():
 
         if res.get("s") == "ok":
             print("✅ API Response: OK")
-            df = pd.DataFrame(res)
-            # Convert t to datetime
-            df["t"] = pd.to_datetime(df["t"], unit="s")
-
-            last_row = df.iloc[-1]
-            print(f"📊 Last Candle Timestamp: {last_row['t']}")
-            print(f"📊 Last Close Price: {last_row['c']}")
+            # Only the last candle matters; candle times are UTC epoch seconds
+            last_ts = datetime.datetime.fromtimestamp(
+                res["t"][-1], datetime.timezone.utc
+            )
+            print(f"📊 Last Candle Timestamp: {last_ts}")
+            print(f"📊 Last Close Price: {res['c'][-1]}")
 
             # Check if it's "fresh"
-            now = datetime.datetime.now()
-            diff = now - last_row["t"]
+            diff = datetime.datetime.now(datetime.timezone.utc) - last_ts
             print(f"🕒 Time since last candle: {diff}")
 
             if diff.days > 2:
@@ -1,37 +1,57 @@
+import asyncio
 import os
-import requests
+import aiohttp
 
 KEY = os.getenv("FMP_KEY")
 if not KEY:
     print("No FMP_KEY found.")
     exit(1)
 
+BASE_URL = "https://financialmodelingprep.com"
+
+# (path, extra query params); the apikey is attached per request
 endpoints = [
-    f"https://financialmodelingprep.com/api/v3/quote/AAPL?apikey={KEY}",
-    f"https://financialmodelingprep.com/api/v3/profile/AAPL?apikey={KEY}",
-    f"https://financialmodelingprep.com/api/v3/income-statement/AAPL?limit=1&apikey={KEY}",
-    f"https://financialmodelingprep.com/api/v3/search?query=AAPL&limit=1&apikey={KEY}",
-    f"https://financialmodelingprep.com/api/v3/stock/list?limit=1&apikey={KEY}",
-    f"https://financialmodelingprep.com/api/v3/market-hours?apikey={KEY}",
-    f"https://financialmodelingprep.com/api/v4/price/AAPL?apikey={KEY}",
-    f"https://financialmodelingprep.com/api/v3/quote-short/AAPL?apikey={KEY}",
+    ("/api/v3/quote/AAPL", {}),
+    ("/api/v3/profile/AAPL", {}),
+    ("/api/v3/income-statement/AAPL", {"limit": 1}),
+    ("/api/v3/search", {"query": "AAPL", "limit": 1}),
+    ("/api/v3/stock/list", {"limit": 1}),
+    ("/api/v3/market-hours", {}),
+    ("/api/v4/price/AAPL", {}),
+    ("/api/v3/quote-short/AAPL", {}),
 ]
 
 print(f"Testing {len(endpoints)} endpoints with key length {len(KEY)}...")
 
-for url in endpoints:
+
+async def probe(session, path, extra):
+    url = f"{BASE_URL}{path}"
+    params = {**extra, "apikey": KEY}
     try:
-        r = requests.get(url, timeout=5)
-        clean_url = url.split("?")[0]
-        if r.status_code == 200:
-            data = r.json()
+        async with session.get(
+            url, params=params, timeout=aiohttp.ClientTimeout(total=5)
+        ) as r:
+            if r.status != 200:
+                return f"❌ {url}: {r.status}"
+            data = await r.json(content_type=None)
             if isinstance(data, dict) and "Error Message" in data:
-                print(
-                    f"❌ {clean_url}: 200 OK but API Error: {data['Error Message'][:50]}..."
+                return (
+                    f"❌ {url}: 200 OK but API Error: {data['Error Message'][:50]}..."
                 )
-            else:
-                print(f"✅ {clean_url}: SUCCESS")
-        else:
-            print(f"❌ {clean_url}: {r.status_code}")
+            return f"✅ {url}: SUCCESS"
     except Exception as e:
-        print(f"❌ {clean_url}: Exception {e}")
+        return f"❌ {url}: Exception {e}"
+
+
+async def main():
+    # All endpoints in flight at once; results print in endpoint order
+    connector = aiohttp.TCPConnector(limit=16)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *(probe(session, path, extra) for path, extra in endpoints)
+        )
+    for line in results:
+        print(line)
+
+
+asyncio.run(main())
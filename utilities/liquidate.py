@@ -11,9 +11,10 @@ import os
 # Ensure the project root is in the path so we can import 'bot'
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import time
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google.cloud import bigquery
 
 # Authentication & Configuration
@@ -34,23 +35,27 @@ def liquidate_alpaca():
 
     print("🛑 PANIC: Starting Alpaca Liquidation...")
 
-    # 1. Cancel all open orders
-    try:
-        res = requests.delete(f"{BASE_URL}/v2/orders", headers=HEADERS)
-        if res.status_code == 200:
-            print("✅ All open orders cancelled.")
-        else:
-            print(f"⚠️ Order cancellation warning: {res.text}")
-    except Exception as e:
-        print(f"❌ Order cancellation failed: {e}")
-
-    # 2. Close all positions
+    # Transient gateway errors are retried so a blip doesn't abort the liquidation
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            max_retries=Retry(
+                total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]
+            )
+        ),
+    )
+
+    # Cancel all open orders and close all positions in one call
     try:
-        res = requests.delete(f"{BASE_URL}/v2/positions", headers=HEADERS)
+        res = session.delete(
+            f"{BASE_URL}/v2/positions", params={"cancel_orders": "true"}, timeout=10
+        )
         if res.status_code == 207:
-            print("✅ All positions closing...")
+            print("✅ All open orders cancelled. All positions closing...")
         elif res.status_code == 200:
-            print("✅ No positions to close.")
+            print("✅ All open orders cancelled. No positions to close.")
         else:
             print(f"⚠️ Position liquidation warning: {res.text}")
     except Exception as e:
@@ -70,15 +75,13 @@ def reset_ledger():
     table_ref = f"{PROJECT_ID}.trading_data.portfolio"
 
     try:
-        # 1. Clear existing holdings
-        client.query(f"TRUNCATE TABLE `{table_ref}`").result()
-
-        # 2. Seed initial cash
-        seed_query = f"""
+        # Clear holdings and seed initial cash in one script job
+        script = f"""
+        TRUNCATE TABLE `{table_ref}`;
         INSERT INTO `{table_ref}` (asset_name, holdings, cash_balance, avg_price, last_updated)
-        VALUES ('USD', 0.0, {INITIAL_EQUITY}, 0.0, CURRENT_TIMESTAMP())
+        VALUES ('USD', 0.0, {INITIAL_EQUITY}, 0.0, CURRENT_TIMESTAMP());
         """
-        client.query(seed_query).result()
+        client.query(script).result()
         print(f"✅ Ledger reset to ${INITIAL_EQUITY:,.2f} Cash.")
         return True
     except Exception as e:
@@ -1,3 +1,4 @@
+import functools
 import os
 from google.cloud import bigquery
 
@@ -7,6 +8,12 @@ DATASET_ID = "trading_data"
 TABLE_ID = "portfolio"
 
 
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    # Explicitly set location for US-Central1 dataset (as per Terraform)
+    return bigquery.Client(project=PROJECT_ID, location="us-central1")
+
+
 def reset_portfolio():
     print(f"⚠️ WARNING: You are about to WIPE the '{TABLE_ID}' table.")
     print(f" Project: {PROJECT_ID}")
@@ -14,26 +21,22 @@ def reset_portfolio():
 
     # In an interactive script we'd ask for confirmation, but this is automation.
 
-    # Explicitly set location for US-Central1 dataset (as per Terraform)
-    client = bigquery.Client(project=PROJECT_ID, location="us-central1")
+    client = _get_client()
     table_ref = f"{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}"
 
-    query = f"TRUNCATE TABLE `{table_ref}`"
+    # Wipe and seed the Global Cash Pool in one script job (one submit/poll)
+    script = f"""
+    TRUNCATE TABLE `{table_ref}`;
+    INSERT INTO `{table_ref}` (asset_name, holdings, cash_balance, avg_price, last_updated)
+    VALUES ('USD', 0.0, 100000.0, 0.0, CURRENT_TIMESTAMP());
+    """
 
-    print(f"🚀 Executing: {query} [Location: us-central1]")
+    print(f"🚀 Truncating {table_ref} [Location: us-central1]")
+    print("🌱 Seeding Global Cash Pool (USD) with $100,000...")
     try:
         # Pass location explicitly to query job as well
-        client.query(query, location="us-central1").result()
+        client.query(script, location="us-central1").result()
         print("✅ SUCCESS: Portfolio table truncated.")
-
-        # New: Seed the Global Cash Pool
-        seed_query = f"""
-        INSERT INTO `{table_ref}` (asset_name, holdings, cash_balance, avg_price, last_updated)
-        VALUES ('USD', 0.0, 100000.0, 0.0, CURRENT_TIMESTAMP())
-        """
-        print("🌱 Seeding Global Cash Pool (USD) with $100,000...")
-        client.query(seed_query, location="us-central1").result()
-
         print("✅ SUCCESS: Global Cash Pool Initialized.")
     except Exception as e:
         print(f"❌ FAILED: {e}")
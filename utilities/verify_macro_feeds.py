@@ -21,11 +21,16 @@ async def verify_macro_feeds():
     if not (fmp_key and finnhub_key and av_key):
         print("🔗 Fetching secrets from GCP Secret Manager...")
         try:
-            import subprocess
+            from google.cloud import secretmanager
+
+            # One client (and gRPC channel) for every missing secret
+            sm = secretmanager.SecretManagerServiceClient()
+            project_id = os.getenv("PROJECT_ID", "utopian-calling-429014-r9")
 
             def get_secret(name):
-                cmd = f"gcloud secrets versions access latest --secret='{name}'"
-                return subprocess.check_output(cmd, shell=True).decode("utf-8").strip()
+                secret = f"projects/{project_id}/secrets/{name}/versions/latest"
+                response = sm.access_secret_version(request={"name": secret})
+                return response.payload.data.decode("UTF-8").strip()
 
             if not fmp_key:
                 fmp_key = get_secret("FMP_KEY")